@@ -0,0 +1,103 @@
+import time
+from collections import namedtuple
+
+# Rulari "anytime": in loc de un numar fix de generatii, o rulare se opreste la primul criteriu atins
+# (generatii, timp, evaluari, generatii fara imbunatatire, cost tinta), iar fiecare solutie mai buna
+# (incumbent) e transmisa imediat, printr-un generator iter_* sau printr-un callback.
+
+Incumbent = namedtuple("Incumbent", ["solution", "fitness", "generation", "evaluations", "elapsed"])
+
+
+class Budget:
+    """
+    Criteriile de oprire ale unei rulari; None = criteriu inactiv. Cel putin unul trebuie dat.
+    :param generations: numarul maxim de generatii
+    :param time_limit: timpul maxim (secunde, wall-clock)
+    :param max_evaluations: numarul maxim de evaluari (counters["evaluations"])
+    :param max_stall: numarul maxim de generatii consecutive fara imbunatatirea incumbentului
+    :param target_fitness: oprire imediata cand incumbentul are costul <= target_fitness
+    """
+
+    def __init__(self, generations=None, time_limit=None, max_evaluations=None, max_stall=None,
+                 target_fitness=None):
+        if all(value is None for value in (generations, time_limit, max_evaluations, max_stall, target_fitness)):
+            raise ValueError("Bugetul nu are niciun criteriu de oprire")
+        self.generations = generations
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.max_stall = max_stall
+        self.target_fitness = target_fitness
+
+    def stop_reason(self, search):
+        """:return: numele primului criteriu atins sau None"""
+        if self.target_fitness is not None and search.best_fitness <= self.target_fitness:
+            return "target_fitness"
+        if self.generations is not None and search.generation >= self.generations:
+            return "generations"
+        if self.max_evaluations is not None and search.evaluations >= self.max_evaluations:
+            return "max_evaluations"
+        if self.max_stall is not None and search.stall >= self.max_stall:
+            return "max_stall"
+        if self.time_limit is not None and search.elapsed >= self.time_limit:
+            return "time_limit"
+        return None
+
+
+class Search:
+    """Starea unei rulari: incumbentul, istoricul per generatie, generatiile fara imbunatatire si bugetul."""
+
+    def __init__(self, budget, counters=None, callback=None):
+        """
+        :param counters: dict-ul de contoare al solverului (de aici se citesc evaluarile)
+        :param callback: optional, apelat cu fiecare Incumbent nou
+        """
+        self.budget = budget
+        self.counters = counters if counters is not None else {}
+        self.callback = callback
+        self.start = time.perf_counter()
+        self.generation = 0
+        self.stall = 0
+        self.best = None
+        self.best_fitness = float('inf')
+        self.history = []
+        self.stop = None
+        self._improved = False
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @property
+    def evaluations(self):
+        return self.counters.get("evaluations", 0)
+
+    def offer(self, solution, fitness):
+        """
+        :return: un Incumbent nou daca solutia e mai buna decat cea curenta (prima solutie e acceptata
+            chiar daca are costul inf, ca rularea sa intoarca mereu un tur), altfel None
+        """
+        fitness = float(fitness)
+        if self.best is not None and fitness >= self.best_fitness:
+            return None
+        # prima solutie (populatia initiala) nu conteaza ca imbunatatire pentru max_stall
+        self._improved = self.best is not None
+        self.best = [int(node) for node in solution]
+        self.best_fitness = fitness
+        incumbent = Incumbent(self.best[:], fitness, self.generation, self.evaluations, self.elapsed)
+        if self.callback is not None:
+            self.callback(incumbent)
+        return incumbent
+
+    def begin_generation(self):
+        self.generation += 1
+
+    def end_generation(self, value=None):
+        """Inchide generatia curenta; `value` (implicit costul incumbentului) se adauga la istoric."""
+        self.stall = 0 if self._improved else self.stall + 1
+        self._improved = False
+        self.history.append(self.best_fitness if value is None else float(value))
+
+    def exhausted(self):
+        if self.stop is None:
+            self.stop = self.budget.stop_reason(self)
+        return self.stop is not None
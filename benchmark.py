@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from crossover import precedence_preserving_crossover
+from exact import solve_exact
+from feasibility import random_topological_population, respects_precedence
+from fitness import calculate_fitness_batch
+from genetic_matrix import calculate_fitness_matrix, mutate_matrix, order_crossover_matrix, run_genetic_algorithm_matrix
+from instance_generator import generate_sop_instance
+from instance_parser import parse_sop_arrays, parse_sop_file
+from moves import MoveEvaluator
+from precedence_index import PrecedenceIndex
+from pso_matrix import generate_swap_sequence, run_pso_matrix, swap_sequences
+
+# Benchmark-uri pentru nucleele solverelor:
+# - micro: timpul per apel al parserului si al functiilor din bucla fierbinte, pe ESC07/25/78
+#   si pe instante sintetice mari (instance_generator)
+# - macro: evaluari/secunda si timpul pana la un cost tinta pentru GA si PSO; tinta e relativa la optim
+#   (KNOWN_OPTIMA sau, pentru alte instante, optimul calculat de solverul exact)
+# Rezultatele se salveaza ca JSON; `compare` semnaleaza incetinirile fata de un baseline.
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sop_instances")
+
+# optimele cunoscute (TSPLIB) pentru instantele incluse
+KNOWN_OPTIMA = {"ESC07": 2125, "ESC25": 1681, "ESC78": 18230}
+
+MICRO_INSTANCES = ["ESC07", "ESC25", "ESC78", "synthetic-200", "synthetic-500"]
+MACRO_INSTANCES = ["ESC25", "ESC78"]
+
+# solverul exact intra in micro-benchmark doar pe instante de atatea noduri (cateva ms per apel)
+MICRO_EXACT_MAX_NODES = 12
+# secunde pentru solverul exact cand optimul unei instante nu e cunoscut
+REFERENCE_TIME_LIMIT = 60.0
+
+_references = {}
+
+
+def synthetic_instance_path(n, density=0.01, seed=0):
+    """Fisierul .sop generat de instance_generator (creat o singura data, in directorul temporar)."""
+    path = os.path.join(tempfile.gettempdir(), f"sop_synthetic_{n}_{density}_{seed}.sop")
+    if not os.path.exists(path):
+        generate_sop_instance(path, n, precedence_density=density, seed=seed)
+    return path
+
+
+def instance_path(name):
+    if name.startswith("synthetic-"):
+        return synthetic_instance_path(int(name.split("-", 1)[1]))
+    return os.path.join(INSTANCE_DIR, name + ".sop")
+
+
+def load_benchmark_instance(name):
+    return parse_sop_file(instance_path(name))
+
+
+def reference_cost(name, nodes, matrix, precedence, time_limit=REFERENCE_TIME_LIMIT):
+    """
+    Optimul instantei: din KNOWN_OPTIMA sau calculat cu solve_exact (memorat per proces).
+    :return: costul optim, sau None daca nu s-a putut demonstra in `time_limit` secunde
+    """
+    if name in KNOWN_OPTIMA:
+        return KNOWN_OPTIMA[name]
+    if name not in _references:
+        result = solve_exact(nodes, matrix, precedence, time_limit=time_limit)
+        _references[name] = result.cost if result.optimal else None
+    return _references[name]
+
+
+def time_call(fn, repeat=5):
+    """Cel mai bun timp per apel (secunde), din `repeat` serii calibrate automat."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _micro_cases(nodes, matrix, precedence):
+    random.seed(0)
+    p1, p2 = random_topological_population(nodes, precedence, 2)
+    population = random_topological_population(nodes, precedence, 100)
+    cost_matrix = np.asarray(matrix)
+    evaluator = MoveEvaluator(matrix, precedence)
+    cases = {
+        "precedence_index": lambda: PrecedenceIndex(len(nodes), precedence),
+        "respects_precedence": lambda: respects_precedence(p1, precedence),
+        "calculate_fitness_matrix": lambda: calculate_fitness_matrix(p1, matrix, precedence),
+        "calculate_fitness_batch_100": lambda: calculate_fitness_batch(population, cost_matrix, precedence),
+        "order_crossover_matrix": lambda: order_crossover_matrix(p1, p2, precedence),
+        "precedence_preserving_crossover": lambda: precedence_preserving_crossover(p1, p2),
+        "mutate_matrix": lambda: mutate_matrix(p1, precedence, 1.0, evaluator),
+        "generate_swap_sequence": lambda: generate_swap_sequence(p1, p2),
+        "swap_sequences_100": lambda: swap_sequences(population, population[::-1]),
+    }
+    if len(nodes) <= MICRO_EXACT_MAX_NODES:
+        cases["solve_exact"] = lambda: solve_exact(nodes, matrix, precedence)
+    return cases
+
+
+def run_micro(instances=MICRO_INSTANCES, repeat=5):
+    results = []
+    for name in instances:
+        path = instance_path(name)
+        nodes, matrix, precedence = parse_sop_file(path)
+        cases = {"parse_sop_arrays": lambda: parse_sop_arrays(path)}
+        cases.update(_micro_cases(nodes, matrix, precedence))
+        for benchmark, fn in cases.items():
+            seconds = time_call(fn, repeat)
+            results.append({"suite": "micro", "benchmark": benchmark, "instance": name,
+                            "metric": "seconds_per_call", "value": seconds, "higher_is_better": False})
+            print(f"micro {name:>14} {benchmark:<32} {seconds * 1e6:12.2f} us")
+    return results
+
+
+MACRO_SOLVERS = {
+    "ga": lambda nodes, matrix, precedence, counters: run_genetic_algorithm_matrix(
+        nodes, matrix, precedence, population_size=50, generations=100, counters=counters),
+    "pso": lambda nodes, matrix, precedence, counters: run_pso_matrix(
+        nodes, matrix, precedence, num_particles=50, generations=100, counters=counters),
+    "ga-sop3": lambda nodes, matrix, precedence, counters: run_genetic_algorithm_matrix(
+        nodes, matrix, precedence, population_size=20, generations=20, local_search="sop3", counters=counters),
+}
+
+
+def run_macro(instances=MACRO_INSTANCES, seeds=(0, 1, 2), target_gap=0.10):
+    """
+    Evaluari/secunda si timpul pana la costul tinta optim * (1 + target_gap) (optimul din reference_cost).
+    Timpul pana la tinta se estimeaza din generatia la care istoricul atinge tinta (generatii de durata egala);
+    rularile care nu ating tinta nu intra in medie. Fara un optim cunoscut nu se masoara timpul pana la tinta.
+    """
+    results = []
+    for name in instances:
+        nodes, matrix, precedence = load_benchmark_instance(name)
+        optimum = reference_cost(name, nodes, matrix, precedence)
+        target = optimum * (1 + target_gap) if optimum is not None else -float('inf')
+        for solver, run in MACRO_SOLVERS.items():
+            rates, hits = [], []
+            for seed in seeds:
+                random.seed(seed)
+                np.random.seed(seed)
+                counters = {}
+                start = time.perf_counter()
+                _, history = run(nodes, matrix, precedence, counters)
+                elapsed = time.perf_counter() - start
+                rates.append(counters.get("evaluations", 0) / elapsed)
+                reached = next((gen for gen, value in enumerate(history) if value <= target), None)
+                if reached is not None:
+                    hits.append(elapsed * (reached + 1) / len(history))
+
+            results.append({"suite": "macro", "benchmark": solver, "instance": name,
+                            "metric": "evaluations_per_second", "value": float(np.mean(rates)),
+                            "higher_is_better": True})
+            if hits:
+                results.append({"suite": "macro", "benchmark": solver, "instance": name,
+                                "metric": "time_to_target", "value": float(np.mean(hits)),
+                                "higher_is_better": False, "target": target,
+                                "success_rate": len(hits) / len(seeds)})
+            print(f"macro {name:>14} {solver:<8} {np.mean(rates):12.0f} eval/s  "
+                  f"target {target:.0f} reached {len(hits)}/{len(seeds)}"
+                  + (f" in {np.mean(hits):.3f}s" if hits else ""))
+    return results
+
+
+def save_results(results, path):
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    :return: lista de regresii (dict cu cheia benchmark-ului, valoarea veche, cea noua si raportul)
+    """
+    key = lambda r: (r["suite"], r["benchmark"], r["instance"], r["metric"])
+    old = {key(r): r for r in baseline}
+    regressions = []
+    for result in current:
+        previous = old.get(key(result))
+        if previous is None or previous["value"] == 0 or result["value"] == 0:
+            continue
+        if result["higher_is_better"]:
+            slowdown = previous["value"] / result["value"]
+        else:
+            slowdown = result["value"] / previous["value"]
+        if slowdown > 1 + threshold:
+            regressions.append({"key": "/".join(map(str, key(result))), "baseline": previous["value"],
+                                "current": result["value"], "slowdown": slowdown})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri micro/macro pentru solverele SOP")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("micro", "macro", "all"):
+        command = commands.add_parser(name)
+        command.add_argument("--output", default="benchmark_results.json")
+        command.add_argument("--instances", nargs="+", default=None)
+    commands.choices["macro"].add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    commands.choices["all"].add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+
+    compare_command = commands.add_parser("compare")
+    compare_command.add_argument("baseline")
+    compare_command.add_argument("current")
+    compare_command.add_argument("--threshold", type=float, default=0.10,
+                                 help="incetinirea relativa tolerata (implicit 0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+        for regression in regressions:
+            print(f"SLOWER {regression['key']}: {regression['baseline']:.6g} -> {regression['current']:.6g} "
+                  f"(x{regression['slowdown']:.2f})")
+        if not regressions:
+            print("Nicio regresie peste pragul de", args.threshold)
+        return 1 if regressions else 0
+
+    results = []
+    if args.command in ("micro", "all"):
+        results += run_micro(args.instances or MICRO_INSTANCES)
+    if args.command in ("macro", "all"):
+        results += run_macro(args.instances or MACRO_INSTANCES, args.seeds)
+    save_results(results, args.output)
+    print("Rezultate salvate in", args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
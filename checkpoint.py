@@ -0,0 +1,109 @@
+import json
+import os
+import random
+
+import numpy as np
+
+from anytime import Budget, Search
+
+# Checkpoint-uri pentru rulari lungi GA/PSO, ca fisiere .npz (doar tablouri NumPy, fara pickle):
+# populatia / roiul, fitness-ul, incumbentul, istoricul, contoarele, starea generatoarelor aleatoare
+# (`random` si `np.random`) si parametrii rularii (ca JSON). Se scriu la sfarsitul unei generatii,
+# deci reluarea (resume_*) continua exact din acel punct si da acelasi rezultat ca rularea neintrerupta.
+# Nu se salveaza FitnessCache: afecteaza doar timpul, nu rezultatele.
+
+CHECKPOINT_VERSION = 1
+
+BUDGET_FIELDS = ("generations", "time_limit", "max_evaluations", "max_stall", "target_fitness")
+
+
+class Checkpoint:
+    """Scrie un checkpoint la fiecare `interval` generatii in acelasi fisier (inlocuit atomic)."""
+
+    def __init__(self, path, interval=10, solver=None, params=None, budget=None):
+        """
+        :param solver: "ga" sau "pso" (verificat la reluare)
+        :param params: parametrii solverului, serializabili JSON
+        :param budget: anytime.Budget-ul rularii (salvat ca sa fie refolosit la reluare)
+        """
+        self.path = path
+        self.interval = interval
+        self.solver = solver
+        self.params = params or {}
+        self.budget = budget
+
+    def due(self, generation):
+        return self.interval and generation % self.interval == 0
+
+    def save(self, search, **arrays):
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "solver": self.solver,
+            "interval": self.interval,
+            "params": self.params,
+            "budget": {field: getattr(self.budget, field) for field in BUDGET_FIELDS} if self.budget else {},
+            "search": {
+                "generation": search.generation,
+                "stall": search.stall,
+                "best_fitness": search.best_fitness,
+                "elapsed": search.elapsed,
+                "counters": search.counters,
+            },
+        }
+        rng_arrays, state["rng"] = rng_state()
+        arrays.update(rng_arrays)
+        arrays["best"] = np.asarray(search.best if search.best is not None else [], dtype=np.int64)
+        arrays["history"] = np.asarray(search.history, dtype=np.float64)
+        arrays["state"] = np.array(json.dumps(state))
+        save_checkpoint(self.path, arrays)
+
+
+def save_checkpoint(path, arrays):
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, solver=None):
+    """:return: (tablourile salvate, starea JSON decodata)"""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    state = json.loads(str(arrays.pop("state")))
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Versiune de checkpoint nesuportata: {state.get('version')!r}")
+    if solver is not None and state["solver"] != solver:
+        raise ValueError(f"Checkpoint-ul e pentru {state['solver']!r}, nu pentru {solver!r}")
+    return arrays, state
+
+
+def rng_state():
+    """Starea lui `random` si `np.random` ca (tablouri, metadate JSON)."""
+    version, python_state, gauss_next = random.getstate()
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    arrays = {"rng_python": np.asarray(python_state, dtype=np.uint32), "rng_numpy": np.asarray(keys, dtype=np.uint32)}
+    meta = {"python": [version, gauss_next], "numpy": [name, int(pos), int(has_gauss), float(cached_gaussian)]}
+    return arrays, meta
+
+
+def restore_rng(arrays, meta):
+    version, gauss_next = meta["python"]
+    random.setstate((version, tuple(int(value) for value in arrays["rng_python"]), gauss_next))
+    name, pos, has_gauss, cached_gaussian = meta["numpy"]
+    np.random.set_state((name, arrays["rng_numpy"], pos, has_gauss, cached_gaussian))
+
+
+def restore_search(arrays, state, counters=None, callback=None):
+    """Reconstruieste Search-ul (buget, incumbent, istoric, contoare) si starea generatoarelor aleatoare."""
+    saved = state["search"]
+    if counters is None:
+        counters = {}
+    counters.update(saved["counters"])
+    search = Search(Budget(**state["budget"]), counters, callback)
+    search.generation = saved["generation"]
+    search.stall = saved["stall"]
+    search.best_fitness = saved["best_fitness"]
+    search.best = arrays["best"].tolist() if arrays["best"].size else None
+    search.history = arrays["history"].tolist()
+    search.start -= saved["elapsed"]
+    restore_rng(arrays, state["rng"])
+    return search
@@ -1,19 +1,16 @@
 from genetic_algorithm import run_genetic_algorithm
 from pso_algorithm import run_pso, create_graph, calculate_fitness
-from instance_parser import parse_sop_file
-from genetic_matrix import run_genetic_algorithm_matrix, calculate_fitness_matrix
-from pso_matrix import run_pso_matrix
-import matplotlib.pyplot as plt
+from experiments import plot_results, run_experiments
 import os
 
 def test_algorithms_on_same_instance():
-    G, nodes, precedence = create_graph()  
+    import matplotlib.pyplot as plt
+
+    G, nodes, precedence = create_graph()
 
-    
     best_ga, fitness_ga = run_genetic_algorithm(G, nodes, precedence,
                                                  population_size=30, generations=50)
 
-    
     best_pso, fitness_pso = run_pso(G, nodes, precedence,
                                      num_particles=30, generations=50)
 
@@ -22,7 +19,6 @@ def test_algorithms_on_same_instance():
     print("PSO - Cea mai buna solutie:", best_pso)
     print("Cost PSO:", calculate_fitness(best_pso, G, precedence))
 
-    
     plt.plot(fitness_ga, label="GA")
     plt.plot(fitness_pso, label="PSO")
     plt.xlabel("Generatie")
@@ -33,52 +29,33 @@ def test_algorithms_on_same_instance():
     plt.show()
 
 
-def test_algorithms_on_real_instances():
+def test_algorithms_on_real_instances(seeds=(0, 1, 2), output="results.jsonl", plot_dir="plots"):
     instances = ["ESC07.sop", "ESC25.sop", "ESC78.sop"]
     base_path = "sop_instances/"
 
+    # toate rularile (instante x algoritmi x seed-uri) merg in paralel, fara ferestre de grafic
+    records = run_experiments(
+        [os.path.join(base_path, instance) for instance in instances],
+        ["ga", "pso"],
+        {"ga": [dict(population_size=50, generations=100)],
+         "pso": [dict(num_particles=50, generations=100)]},
+        seeds,
+        output,
+    )
+
     for instance in instances:
         print("\n====================")
         print(f" Testare pe instanta: {instance}")
         print("====================")
+        for algorithm, label in (("ga", "GA"), ("pso", "PSO")):
+            costs = [r["best_cost"] for r in records if r["instance"] == instance and r["algorithm"] == algorithm]
+            print(f"{label} -> Cel mai bun cost: {min(costs)} (media pe {len(costs)} seed-uri: {sum(costs) / len(costs):.1f})")
 
-        filepath = os.path.join(base_path, instance)
-        nodes, matrix, precedence = parse_sop_file(filepath)
-
-        
-        best_ga, fitness_ga = run_genetic_algorithm_matrix(
-            nodes, matrix, precedence,
-            population_size=50,
-            generations=100
-        )
-        cost_ga = calculate_fitness_matrix(best_ga, matrix, precedence)
-        print(f"GA -> Cel mai bun cost: {cost_ga}")
-
-        
-        best_pso, fitness_pso = run_pso_matrix(
-            nodes, matrix, precedence,
-            num_particles=50,
-            generations=100
-        )
-        cost_pso = calculate_fitness_matrix(best_pso, matrix, precedence)
-        print(f"PSO -> Cel mai bun cost: {cost_pso}")
+    if plot_dir:
+        for path in plot_results(records, plot_dir):
+            print("Grafic salvat:", path)
 
-        
-        plt.figure()
-        plt.plot(fitness_ga, label="Genetic Algorithm (GA)")
-        plt.plot(fitness_pso, label="Particle Swarm Optimization (PSO)")
-        plt.xlabel("Generatie")
-        plt.ylabel("Fitness")
-        plt.title(f"Comparare GA vs PSO - {instance}")
-        plt.grid()
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
 
 if __name__ == "__main__":
-   # test_algorithms_on_same_instance()
+    # test_algorithms_on_same_instance()
     test_algorithms_on_real_instances()
-    
-
-
-
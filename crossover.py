@@ -0,0 +1,95 @@
+import random
+
+from feasibility import repair_precedence, respects_precedence
+from fitness import count
+
+# Operatori de incrucisare pentru permutari cu precedente.
+# Daca ambii parinti sunt valizi, "ppx" si "one_point" dau copii valizi prin constructie, in O(n);
+# "ox" (order crossover clasic) incearca de cel mult max_attempts ori, apoi cade pe "ppx";
+# "ox_repair" face un singur OX si repara copilul daca incalca precedenta.
+
+
+def precedence_preserving_crossover(parent1, parent2, precedence_constraints=None, counters=None):
+    """
+    PPX: la fiecare pas se alege aleator un parinte si se ia primul lui nod inca nefolosit.
+    Copilul pastreaza orice ordine relativa comuna ambilor parinti.
+    """
+    count(counters, "crossover_attempts")
+    parents = (parent1, parent2)
+    pointers = [0, 0]
+    used = set()
+    child = []
+
+    for _ in range(len(parent1)):
+        k = 0 if random.random() < 0.5 else 1
+        parent = parents[k]
+        pointer = pointers[k]
+        while parent[pointer] in used:
+            pointer += 1
+        pointers[k] = pointer + 1
+        node = parent[pointer]
+        used.add(node)
+        child.append(node)
+
+    return child
+
+
+def one_point_order_crossover(parent1, parent2, precedence_constraints=None, counters=None):
+    """
+    Prefixul lui parent1 pana la un punct de taiere aleator, urmat de nodurile ramase in ordinea din parent2.
+    Un prefix al unei ordini valide e inchis la predecesori, deci copilul ramane valid.
+    """
+    count(counters, "crossover_attempts")
+    cut = random.randrange(1, len(parent1)) if len(parent1) > 1 else len(parent1)
+    child = list(parent1[:cut])
+    taken = set(child)
+    child.extend(node for node in parent2 if node not in taken)
+    return child
+
+
+def order_crossover(parent1, parent2, precedence_constraints, counters=None, max_attempts=20):
+    """OX cu numar limitat de incercari; daca niciun copil nu e valid se foloseste PPX."""
+    size = len(parent1)
+    for _ in range(max_attempts):
+        count(counters, "crossover_attempts")
+        start, end = sorted(random.sample(range(size), 2))
+        segment = parent1[start:end + 1]
+        taken = set(segment)
+        rest = [node for node in parent2 if node not in taken]
+        child = rest[:start] + list(segment) + rest[start:]
+        if respects_precedence(child, precedence_constraints):
+            return child
+
+    count(counters, "crossover_fallbacks")
+    return precedence_preserving_crossover(parent1, parent2, precedence_constraints, counters)
+
+
+def repaired_order_crossover(parent1, parent2, precedence_constraints, counters=None):
+    """Un singur OX; un copil invalid e reparat (repair_precedence) si numarat in counters["repairs"]."""
+    count(counters, "crossover_attempts")
+    size = len(parent1)
+    start, end = sorted(random.sample(range(size), 2)) if size > 1 else (0, size - 1)
+    segment = parent1[start:end + 1]
+    taken = set(segment)
+    rest = [node for node in parent2 if node not in taken]
+    child = rest[:start] + list(segment) + rest[start:]
+    if respects_precedence(child, precedence_constraints):
+        return child
+
+    count(counters, "repairs")
+    return repair_precedence(child, precedence_constraints)
+
+
+CROSSOVER_OPERATORS = {
+    "ox": order_crossover,
+    "ox_repair": repaired_order_crossover,
+    "ppx": precedence_preserving_crossover,
+    "one_point": one_point_order_crossover,
+}
+
+
+def get_crossover(name):
+    try:
+        return CROSSOVER_OPERATORS[name]
+    except KeyError:
+        raise ValueError(f"Operator de incrucisare necunoscut: {name!r} (disponibile: {sorted(CROSSOVER_OPERATORS)})")
@@ -0,0 +1,107 @@
+import numpy as np
+
+# Hash-uri Zobrist pentru permutari: h(order) = XOR peste pozitii al key(pozitie, nod), cu chei aleatoare
+# de 64 biti. Doua ture identice au acelasi hash, deci copiile dintr-o populatie / un roi se gasesc
+# in O(1) per individ (dict / np.unique pe hash-uri), iar un swap actualizeaza hash-ul in O(1).
+# Coliziunile (probabilitate ~P^2 / 2^64 per generatie) sunt neglijate.
+# Cheile nu se tin intr-un tabel n x n (800 MB la n = 10k): key(i, v) = splitmix64(seed ^ (i * n + v)),
+# calculata la cerere. Nu consuma din `random` / `np.random`, deci reproductibilitatea rularilor
+# (seed, checkpoint) nu se schimba.
+
+# ce fac solverele cu copiile: "skip" - nu se reevalueaza (costul se copiaza),
+# "randomize" - copiile (in afara de prima aparitie) sunt inlocuite cu ordini topologice aleatoare noi;
+# None (implicit) - fara hash-uri, toti indivizii se evalueaza
+CLONE_POLICIES = ("skip", "randomize")
+
+ZOBRIST_SEED = 0x5EED50B
+
+
+def check_clone_policy(clones):
+    if clones is not None and clones not in CLONE_POLICIES:
+        raise ValueError(f"Tratare necunoscuta a copiilor: {clones!r} (disponibile: {CLONE_POLICIES} sau None)")
+
+
+def _splitmix64(values):
+    with np.errstate(over='ignore'):
+        values = values + np.uint64(0x9E3779B97F4A7C15)
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class ZobristHash:
+
+    def __init__(self, n, seed=ZOBRIST_SEED):
+        self.n = n
+        self.seed = np.uint64(seed)
+        self._positions = np.arange(n, dtype=np.uint64)
+
+    def keys(self, positions, nodes):
+        """Cheile (pozitie, nod), element cu element (tablouri de aceeasi forma sau broadcast)."""
+        cells = np.asarray(positions, dtype=np.uint64) * np.uint64(self.n) + np.asarray(nodes, dtype=np.uint64)
+        return _splitmix64(cells ^ self.seed).view(np.int64)
+
+    def hash(self, order):
+        return int(np.bitwise_xor.reduce(self.keys(self._positions, order)))
+
+    def hash_batch(self, population):
+        """:return: tablou int64 cu hash-ul fiecarui rand din populatia P x n"""
+        population = np.asarray(population)
+        if len(population) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.bitwise_xor.reduce(self.keys(self._positions, population), axis=1)
+
+    def swap_delta(self, i, a, j, b):
+        """
+        Ce se aplica (XOR) pe hash cand nodurile a (pozitia i) si b (pozitia j) se interschimba;
+        merge si pe tablouri (un swap per rand).
+        """
+        return self.keys(i, a) ^ self.keys(j, b) ^ self.keys(i, b) ^ self.keys(j, a)
+
+    def swapped(self, value, order, i, j):
+        """Hash-ul lui `order` dupa interschimbarea pozitiilor i si j, din hash-ul `value` al lui `order`."""
+        return value ^ int(self.swap_delta(i, order[i], j, order[j]))
+
+
+def first_occurrences(hashes):
+    """
+    :return: pentru fiecare individ, indicele primei aparitii a aceluiasi hash (el insusi daca e unic)
+    """
+    seen = {}
+    return np.fromiter((seen.setdefault(value, idx) for idx, value in enumerate(hashes.tolist())),
+                       dtype=np.int64, count=len(hashes))
+
+
+def distinct_count(hashes):
+    return len(np.unique(hashes))
+
+
+def positional_entropy(population):
+    """
+    Entropia Shannon a nodurilor de pe fiecare pozitie, mediata pe pozitii si normalizata la [0, 1]
+    (0 = toti indivizii identici, 1 = pe fiecare pozitie toti indivizii au noduri diferite).
+    """
+    population = np.asarray(population, dtype=np.int64)
+    size, n = population.shape
+    if size < 2 or n == 0:
+        return 0.0
+    # perechile (pozitie, nod) distincte si frecventa lor; memoria e O(P * n), nu O(n^2)
+    _, counts = np.unique((np.arange(n) * n + population).ravel(), return_counts=True)
+    p = counts / size
+    entropy = -(p * np.log(p)).sum() / n
+    return max(0.0, float(entropy / np.log(min(size, n))))
+
+
+def distinct_rows(population):
+    population = np.asarray(population)
+    return len(np.unique(population, axis=0)) if len(population) else 0
+
+
+def population_diversity(population, hashes=None):
+    """
+    :param hashes: hash-urile Zobrist ale indivizilor, daca solverul le are deja (altfel se compara randurile)
+    :return: (numarul de indivizi distincti, entropia pozitionala)
+    """
+    population = np.asarray(population, dtype=np.int64)
+    distinct = distinct_count(hashes) if hashes is not None else distinct_rows(population)
+    return distinct, positional_entropy(population)
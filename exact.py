@@ -0,0 +1,298 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from fitness import FORBIDDEN_COST
+from local_search import LocalSearch
+from precedence_index import PrecedenceIndex
+
+# Solver exact pentru instante SOP mici, folosit ca referinta (oracol) pentru GA/PSO:
+# - "dp": programare dinamica Held-Karp peste submultimile inchise la precedenta (idealuri), nivel cu nivel.
+#   O stare e (multimea vizitata S, ultimul nod v), cu S ca masca uint64 (n <= 64); fiecare nivel e tinut
+#   in tablouri NumPy sortate (masca, ultim, cost, predecesor) si extins vectorizat, cate un nod nou odata.
+# - "bnb": branch-and-bound in adancime (pentru instante mai mari sau cand DP-ul depaseste memoria), cu
+#   un memo marginit (S, v) -> cel mai mic cost vazut.
+# Ambele taie starile cu marginea inferioara cost + suma celor mai ieftine muchii de intrare ale nodurilor
+# nevizitate, fata de o margine superioara (ordinea `initial` sau ordinea greedy imbunatatita cu SOP-3).
+# Fara o ordine completa gasita in timp, rezultatul are order=None si cost=inf.
+
+ExactResult = namedtuple("ExactResult", ["order", "cost", "optimal", "method", "states", "elapsed"])
+
+METHODS = ("auto", "dp", "bnb")
+
+DP_MAX_NODES = 64
+# octeti per intrare in memo-ul branch-and-bound (dict de int-uri Python)
+BNB_ENTRY_BYTES = 160
+
+
+class ExactLimitExceeded(RuntimeError):
+    """DP-ul a depasit limita de memorie sau de timp (`states`: starile generate pana atunci)."""
+
+    def __init__(self, reason, states=0):
+        super().__init__(reason)
+        self.states = states
+
+
+class _Instance:
+
+    def __init__(self, nodes, matrix, precedence_constraints):
+        self.costs = np.asarray(matrix, dtype=np.int64)
+        self.n = n = len(self.costs)
+        if len(nodes) != n:
+            raise ValueError(f"{len(nodes)} noduri pentru o matrice {n} x {n}")
+        self.index = index = PrecedenceIndex.from_instance(nodes, precedence_constraints)
+        # muchiile interzise (>= FORBIDDEN_COST), intrarile -1 de precedenta si diagonala nu se folosesc
+        self.allowed = (self.costs >= 0) & (self.costs < FORBIDDEN_COST)
+        np.fill_diagonal(self.allowed, False)
+        # predecesorii directi sunt suficienti: stramosii lor au fost deja vizitati inaintea lor
+        self.predecessor_masks = [sum(1 << p for p in index.predecessors[v]) for v in range(n)]
+        self.descendant_masks = [0] * n
+        for v in reversed(index.topological_order):
+            mask = 0
+            for s in index.successors[v]:
+                mask |= (1 << s) | self.descendant_masks[s]
+            self.descendant_masks[v] = mask
+        self.starts = [v for v in range(n) if not self.predecessor_masks[v]]
+        self.is_start = np.zeros(n, dtype=np.int64)
+        self.is_start[self.starts] = 1
+        # cea mai ieftina muchie prin care se poate intra in fiecare nod, dintr-un nod care nu e descendent
+        # al lui si nu e nod de start. Un nod de start (ex. nodul 0 din ESC, cu un rand de zerouri) intra
+        # in cel mult un nod, deci marginea inferioara a restului drumului e
+        #   suma cheapest_in pe nodurile nevizitate - start_gap * (starturi nevizitate + [ultimul e start])
+        self.cheapest_in = []
+        start_gap = 0
+        for w in range(n):
+            sources = self.allowed[:, w].copy()
+            sources[[u for u in range(n) if (self.descendant_masks[w] >> u) & 1]] = False
+            cheapest = int(self.costs[sources, w].min()) if sources.any() else 0
+            sources[self.starts] = False
+            self.cheapest_in.append(int(self.costs[sources, w].min()) if sources.any() else cheapest)
+            start_gap = max(start_gap, self.cheapest_in[w] - cheapest)
+        self.start_gap = start_gap
+
+    def greedy_order(self):
+        """Ordinea construita mereu cu cea mai ieftina muchie permisa (None daca se blocheaza)."""
+        costs, allowed = self.costs.tolist(), self.allowed.tolist()
+        mask, order = 0, []
+        for _ in range(self.n):
+            available = [w for w in range(self.n) if not (mask >> w) & 1 and not self.predecessor_masks[w] & ~mask
+                         and (not order or allowed[order[-1]][w])]
+            if not available:
+                return None
+            node = min(available, key=lambda w: costs[order[-1]][w] if order else self.cheapest_in[w])
+            order.append(node)
+            mask |= 1 << node
+        return order
+
+    def incumbent(self, initial=None, time_limit=1.0):
+        """
+        (ordine, cost): cea mai buna dintre `initial` si ordinea greedy imbunatatita cu SOP-3-exchange
+        (cel mult `time_limit` secunde); (None, inf) daca niciuna nu e valida.
+        """
+        costs, allowed = self.costs.tolist(), self.allowed.tolist()
+        candidates = [initial]
+        greedy = self.greedy_order()
+        if greedy is not None:
+            improved, _ = LocalSearch(self.costs, self.index).improve(greedy, "sop3", time_limit=time_limit)
+            candidates.append(improved)
+        best = (None, float('inf'))
+        for order in candidates:
+            if order is None:
+                continue
+            order = [int(node) for node in order]
+            cost = tour_cost(order, costs, allowed)
+            if cost < best[1]:
+                best = (order, cost)
+        return best
+
+
+def solve_exact(nodes, matrix, precedence_constraints, method="auto", time_limit=None, memory_limit=512,
+                initial=None):
+    """
+    Ordinea de cost minim care respecta precedentele (drum hamiltonian, ca in calculate_fitness_batch).
+    :param nodes, matrix, precedence_constraints: ca din parse_sop_file sau load_instance
+    :param method: "dp", "bnb" sau "auto" (DP pentru n <= 64, apoi branch-and-bound daca DP-ul depaseste memoria)
+    :param time_limit: secunde (None = fara limita); la expirare (sau cand "dp" depaseste memoria) se intoarce
+        cea mai buna ordine gasita, cu optimal=False
+    :param memory_limit: MB pentru starile DP / memo-ul branch-and-bound
+    :param initial: o ordine valida cunoscuta (ex. de la GA); costul ei (sau al ordinii greedy) e marginea
+        superioara cu care DP-ul si branch-and-bound-ul taie starile
+    :return: ExactResult(order, cost, optimal, method, states, elapsed)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Metoda necunoscuta: {method!r} (disponibile: {METHODS})")
+    start = time.perf_counter()
+    deadline = start + time_limit if time_limit is not None else None
+    instance = _Instance(nodes, matrix, precedence_constraints)
+    memory = memory_limit * 2 ** 20
+    incumbent = instance.incumbent(initial, 1.0 if time_limit is None else min(1.0, time_limit / 10))
+
+    if method == "dp" or (method == "auto" and instance.n <= DP_MAX_NODES):
+        try:
+            order, cost, states = _held_karp(instance, memory, deadline, incumbent[1])
+            return ExactResult(order, cost, True, "dp", states, time.perf_counter() - start)
+        except ExactLimitExceeded as error:
+            if method == "dp":
+                order, cost = incumbent
+                return ExactResult(order, cost, False, "dp", error.states, time.perf_counter() - start)
+    order, cost, optimal, states = _branch_and_bound(instance, memory // BNB_ENTRY_BYTES, deadline, incumbent)
+    return ExactResult(order, cost, optimal, "bnb", states, time.perf_counter() - start)
+
+
+def _held_karp(instance, memory, deadline, upper_bound=float('inf')):
+    """
+    Nivelul k contine starile (S, v) cu |S| = k, sortate dupa (v, masca S); pentru fiecare se pastreaza
+    doar masca (uint64) si penultimul nod (int8), plus pozitia de inceput a fiecarui v (offsets).
+    Candidatii obtinuti adaugand nodul w au toti ultimul nod w, deci se deduplica pe grupe, per w.
+    :param memory: octeti pentru nivelurile pastrate si nivelul in lucru
+    :return: (ordine, cost, numarul de stari)
+    """
+    n = instance.n
+    if n > DP_MAX_NODES:
+        raise ValueError(f"DP-ul pe masti uint64 accepta cel mult {DP_MAX_NODES} noduri (instanta are {n})")
+    if n == 0:
+        return [], 0.0, 0
+    bits = np.left_shift(np.uint64(1), np.arange(n, dtype=np.uint64))
+    predecessor_masks = np.array(instance.predecessor_masks, dtype=np.uint64)
+    costs, allowed = instance.costs, instance.allowed
+    cheapest_in = np.array(instance.cheapest_in, dtype=np.int64)
+    is_start, start_gap = instance.is_start, instance.start_gap
+
+    lasts = np.array(sorted(instance.starts), dtype=np.int8)
+    masks = bits[lasts]
+    values = np.zeros(len(lasts), dtype=np.int64)
+    # marginea inferioara a restului drumului (vezi _Instance): suma cheapest_in pe nodurile nevizitate
+    # si numarul nodurilor de start care mai pot fi sursa unei muchii (nevizitate sau ultimul nod)
+    remaining = cheapest_in.sum() - cheapest_in[lasts]
+    start_sources = np.full(len(lasts), len(instance.starts), dtype=np.int64)
+    levels = [(masks, np.full(len(lasts), -1, dtype=np.int8), np.searchsorted(lasts, np.arange(n + 1)))]
+    states = stored = 0
+
+    for _ in range(n - 1):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise ExactLimitExceeded("timp", states)
+        states += len(masks)
+        stored += masks.nbytes + len(masks) + levels[-1][2].nbytes
+        working = len(masks) * 33
+        groups = []
+        for node in range(n):
+            bit = bits[node]
+            # nodul nu e vizitat, toti predecesorii lui sunt si muchia ultim -> nod e permisa
+            chosen = np.flatnonzero(((masks & bit) == 0) & ((predecessor_masks[node] & ~masks) == 0)
+                                    & allowed[lasts, node])
+            new_values = values[chosen] + costs[lasts[chosen], node]
+            new_remaining = remaining[chosen] - cheapest_in[node]
+            new_sources = start_sources[chosen] - is_start[lasts[chosen]]
+            # starile care nu pot cobori sub marginea superioara se taie (egalitatea ramane: optimul poate fi chiar ea)
+            promising = np.flatnonzero(new_values + new_remaining - start_gap * new_sources <= upper_bound)
+            if not len(promising):
+                continue
+            chosen, new_values, new_remaining, new_sources = (array[promising] for array in
+                                                              (chosen, new_values, new_remaining, new_sources))
+            new_masks = masks[chosen] | bit
+            # pentru fiecare masca ramane candidatul cel mai ieftin; grupa ramane sortata dupa masca
+            order = np.lexsort((new_values, new_masks))
+            new_masks = new_masks[order]
+            keep = np.ones(len(order), dtype=bool)
+            keep[1:] = new_masks[1:] != new_masks[:-1]
+            order = order[keep]
+            groups.append((node, new_masks[keep], new_values[order], new_remaining[order], new_sources[order],
+                           lasts[chosen[order]]))
+            working += len(order) * 34
+            if stored + working > memory:
+                raise ExactLimitExceeded("memorie", states)
+        if not groups:
+            return None, float('inf'), states
+
+        sizes = np.zeros(n, dtype=np.int64)
+        sizes[[group[0] for group in groups]] = [len(group[1]) for group in groups]
+        masks, values, remaining, start_sources, previous = (np.concatenate(parts)
+                                                             for parts in list(zip(*groups))[1:])
+        lasts = np.repeat(np.arange(n, dtype=np.int8), sizes)
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        levels.append((masks, previous, offsets))
+        del groups
+    states += len(masks)
+
+    best = int(np.argmin(values))
+    cost = float(values[best])
+    order = [int(lasts[best])]
+    mask, previous = masks[best], int(levels[-1][1][best])
+    for level_masks, level_previous, offsets in reversed(levels[:-1]):
+        mask = mask & ~bits[order[-1]]
+        low, high = offsets[previous], offsets[previous + 1]
+        position = low + int(np.searchsorted(level_masks[low:high], mask))
+        order.append(previous)
+        previous = int(level_previous[position])
+    order.reverse()
+    return order, cost, states
+
+
+def tour_cost(order, costs, allowed):
+    """Costul ordinii (inf daca foloseste o muchie nepermisa)."""
+    total = 0
+    for u, v in zip(order, order[1:]):
+        if not allowed[u][v]:
+            return float('inf')
+        total += costs[u][v]
+    return float(total)
+
+
+def _branch_and_bound(instance, max_entries, deadline, incumbent=(None, float('inf'))):
+    n = instance.n
+    costs = instance.costs.tolist()
+    allowed = instance.allowed.tolist()
+    predecessor_masks = instance.predecessor_masks
+    full = (1 << n) - 1
+
+    cheapest_in = instance.cheapest_in
+    # lista de succesori posibili ai fiecarui nod, de la muchia cea mai ieftina
+    neighbours = [sorted((w for w in range(n) if allowed[v][w]), key=lambda w, v=v: costs[v][w]) for v in range(n)]
+
+    best_order, best_cost = incumbent
+    memo = {}
+    path = []
+    visited_nodes = 0
+    timed_out = False
+
+    is_start, start_gap = instance.is_start.tolist(), instance.start_gap
+
+    def search(mask, last, cost, remaining, start_sources):
+        nonlocal best_cost, best_order, visited_nodes, timed_out
+        visited_nodes += 1
+        if deadline is not None and visited_nodes % 4096 == 0 and time.perf_counter() > deadline:
+            timed_out = True
+        if timed_out:
+            return
+        if mask == full:
+            if cost < best_cost:
+                best_cost, best_order = cost, path[:]
+            return
+        key = (mask, last)
+        seen = memo.get(key)
+        if seen is not None and seen <= cost:
+            return
+        if seen is not None or len(memo) < max_entries:
+            memo[key] = cost
+        row = costs[last]
+        new_sources = start_sources - is_start[last]
+        for w in neighbours[last]:
+            if (mask >> w) & 1 or predecessor_masks[w] & ~mask:
+                continue
+            new_cost = cost + row[w]
+            new_remaining = remaining - cheapest_in[w]
+            if new_cost + new_remaining - start_gap * new_sources >= best_cost:
+                continue
+            path.append(w)
+            search(mask | (1 << w), w, new_cost, new_remaining, new_sources)
+            path.pop()
+
+    total_in = sum(cheapest_in)
+    for first in sorted(instance.starts, key=lambda v: cheapest_in[v]):
+        path.append(first)
+        search(1 << first, first, 0, total_in - cheapest_in[first], len(instance.starts))
+        path.pop()
+
+    optimal = not timed_out
+    return best_order, float(best_cost) if best_order is not None else float('inf'), optimal, visited_nodes
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from fitness import calculate_fitness_batch
+from genetic_matrix import run_genetic_algorithm_matrix
+from instance_parser import load_instance
+from pso_matrix import run_pso_matrix
+from shared_instance import SharedInstance
+
+# Rulari headless de tip instante x algoritmi x seturi de parametri x seed-uri, in paralel.
+# Fiecare rulare terminata se scrie imediat ca o linie JSON (si optional ca rand CSV);
+# graficele se fac separat, din fisierul de rezultate (plot_results).
+# Fiecare instanta se incarca o singura data in memorie partajata; workerii se ataseaza fara copii.
+
+ALGORITHMS = {
+    "ga": run_genetic_algorithm_matrix,
+    "pso": run_pso_matrix,
+}
+
+CSV_FIELDS = ["instance", "algorithm", "params", "seed", "best_cost", "wall_time", "evaluations",
+              "generations", "best_solution"]
+
+
+def expand_grid(instances, algorithms, param_sets=None, seeds=(0,)):
+    """
+    :param param_sets: dict algoritm -> lista de dict-uri cu parametri (implicit [{}] pentru fiecare)
+    :return: lista de rulari (dict cu instance, algorithm, params, seed)
+    """
+    param_sets = param_sets or {}
+    runs = []
+    for instance, algorithm in itertools.product(instances, algorithms):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritm necunoscut: {algorithm!r} (disponibili: {sorted(ALGORITHMS)})")
+        for params, seed in itertools.product(param_sets.get(algorithm) or [{}], seeds):
+            runs.append({"instance": instance, "algorithm": algorithm, "params": dict(params), "seed": seed})
+    return runs
+
+
+def run_single(run, instance=None):
+    """
+    :param instance: SharedInstance optional cu instanta deja incarcata (altfel se citeste din cache)
+    """
+    random.seed(run["seed"])
+    np.random.seed(run["seed"])
+    if instance is not None:
+        nodes, matrix, precedence = instance.nodes, instance.matrix, instance.index
+    else:
+        nodes, matrix, precedence = load_instance(run["instance"])
+    counters = {}
+
+    start = time.perf_counter()
+    result = ALGORITHMS[run["algorithm"]](nodes, matrix, precedence, counters=counters, **run["params"])
+    wall_time = time.perf_counter() - start
+    # cu profile=True in parametri solverul intoarce si RunStats-ul: (best, history, stats)
+    best, history = result[:2]
+
+    best_cost = float(calculate_fitness_batch([best], matrix, precedence)[0])
+    record = dict(run,
+                  instance=os.path.basename(run["instance"]),
+                  best_cost=best_cost,
+                  best_solution=[int(node) for node in best],
+                  history=[float(value) for value in history],
+                  wall_time=wall_time,
+                  evaluations=counters.get("evaluations", 0),
+                  generations=len(history))
+    if len(result) > 2:
+        record["profile"] = result[2].as_dict()
+    return record
+
+
+def run_experiments(instances, algorithms, param_sets=None, seeds=(0,),
+                    output="results.jsonl", csv_path=None, processes=None):
+    """
+    Ruleaza toata grila intr-un pool de procese si scrie rezultatele pe masura ce se termina.
+    :return: lista inregistrarilor (in ordinea terminarii)
+    """
+    runs = expand_grid(instances, algorithms, param_sets, seeds)
+    records = []
+
+    shared = {}
+    csv_file = open(csv_path, 'w', newline='') if csv_path else None
+    try:
+        for run in runs:
+            if run["instance"] not in shared:
+                shared[run["instance"]] = SharedInstance.from_file(run["instance"])
+
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, extrasaction='ignore') if csv_file else None
+        if writer:
+            writer.writeheader()
+
+        with open(output, 'w') as jsonl, ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(run_single, run, shared[run["instance"]]) for run in runs]
+            for future in as_completed(futures):
+                record = future.result()
+                records.append(record)
+                jsonl.write(json.dumps(record) + "\n")
+                jsonl.flush()
+                if writer:
+                    writer.writerow(dict(record, params=json.dumps(record["params"]),
+                                         best_solution=" ".join(map(str, record["best_solution"]))))
+                    csv_file.flush()
+                print(f"{record['instance']} {record['algorithm']} seed={record['seed']} "
+                      f"-> {record['best_cost']} ({record['wall_time']:.2f}s)")
+    finally:
+        if csv_file:
+            csv_file.close()
+        for instance in shared.values():
+            instance.close()
+            instance.unlink()
+
+    return records
+
+
+def load_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def plot_results(records, output_dir="plots"):
+    """Cate un grafic PNG per instanta: media istoricului peste seed-uri, pentru fiecare algoritm/parametri."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for instance in sorted({record["instance"] for record in records}):
+        groups = {}
+        for record in records:
+            if record["instance"] == instance:
+                label = record["algorithm"] + (f" {json.dumps(record['params'])}" if record["params"] else "")
+                groups.setdefault(label, []).append(record["history"])
+
+        plt.figure()
+        for label, histories in sorted(groups.items()):
+            length = min(len(history) for history in histories)
+            plt.plot(np.mean([history[:length] for history in histories], axis=0), label=label)
+        plt.xlabel("Generatie")
+        plt.ylabel("Fitness")
+        plt.title(f"Comparare - {instance}")
+        plt.grid()
+        plt.legend()
+        plt.tight_layout()
+        path = os.path.join(output_dir, f"{os.path.splitext(instance)[0]}.png")
+        plt.savefig(path)
+        plt.close()
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rulari GA/PSO in paralel pe instante TSPLIB-SOP")
+    parser.add_argument("instances", nargs="+", help="fisiere .sop")
+    parser.add_argument("--algorithms", nargs="+", default=["ga", "pso"], choices=sorted(ALGORITHMS))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--params", type=json.loads, default=None,
+                        help='JSON: {"ga": [{"generations": 200}], "pso": [{"num_particles": 100}]}')
+    parser.add_argument("--output", default="results.jsonl")
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--plot", metavar="DIR", default=None, help="scrie graficele in DIR dupa rulare")
+    args = parser.parse_args(argv)
+
+    records = run_experiments(args.instances, args.algorithms, args.params, args.seeds,
+                              args.output, args.csv, args.processes)
+    if args.plot:
+        plot_results(records, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import random
+
+import numpy as np
+
+
+def position_index(permutation):
+    """Pozitia fiecarui nod in permutare: position[node] = index."""
+    return dict(zip(permutation, range(len(permutation))))
+
+
+def as_precedence_array(precedence_constraints):
+    return np.asarray(precedence_constraints, dtype=np.int64).reshape(-1, 2)
+
+
+def respects_precedence(chromosome, precedence_constraints):
+    """
+    Verifica daca un cromozom respecta toate constrangerile de precedenta, in O(n + m).
+    :param chromosome: o lista (sau tablou) de noduri (ex: [1, 2, 3, 4, 5])
+    :param precedence_constraints: lista de tupluri (ex: [(1, 3), (2, 4)]) sau tablou m x 2
+    :return: True daca e valid, False daca nu
+    """
+    if isinstance(precedence_constraints, np.ndarray):
+        return bool(respects_precedence_batch(np.asarray(chromosome)[None, :], precedence_constraints)[0])
+
+    position = position_index(chromosome)
+    for before, after in precedence_constraints:
+        if position[before] > position[after]:
+            return False
+    return True
+
+
+def inverse_positions(population):
+    """Pentru o populatie (P x n) cu nodurile 0..n-1: positions[k, node] = index in individul k."""
+    population = np.asarray(population)
+    size, n = population.shape
+    positions = np.empty_like(population)
+    positions[np.arange(size)[:, None], population] = np.arange(n)
+    return positions
+
+
+def respects_precedence_batch(population, precedence_constraints):
+    """
+    Verifica toata populatia (P x n, noduri 0..n-1) dintr-o singura trecere vectorizata.
+    :return: tablou bool de lungime P
+    """
+    positions = inverse_positions(population)
+    precedence = as_precedence_array(precedence_constraints)
+    if precedence.size == 0:
+        return np.ones(positions.shape[0], dtype=bool)
+    return (positions[:, precedence[:, 0]] < positions[:, precedence[:, 1]]).all(axis=1)
+
+
+def _precedence_graph(nodes, precedence_constraints):
+    successors = {node: [] for node in nodes}
+    indegree = dict.fromkeys(nodes, 0)
+    if isinstance(precedence_constraints, np.ndarray):
+        precedence_constraints = precedence_constraints.tolist()
+    for before, after in precedence_constraints:
+        successors[before].append(after)
+        indegree[after] += 1
+    return successors, indegree
+
+
+def predecessor_lists(nodes, precedence_constraints):
+    """predecessors[node] = nodurile care trebuie vizitate inaintea lui node (precedente directe)."""
+    predecessors = {node: [] for node in nodes}
+    if isinstance(precedence_constraints, np.ndarray):
+        precedence_constraints = precedence_constraints.tolist()
+    for before, after in precedence_constraints:
+        predecessors[after].append(before)
+    return predecessors
+
+
+def repair_precedence(permutation, precedence_constraints=None, predecessors=None):
+    """
+    Cea mai apropiata permutare valida, in O(n + m): nodurile se parcurg in ordinea curenta, iar inaintea
+    fiecarui nod se trag (DFS, in post-ordine) predecesorii lui inca neplasati. O permutare deja valida
+    ramane neschimbata, iar nodurile care nu incalca nimic isi pastreaza ordinea relativa.
+    :param predecessors: optional, rezultatul lui predecessor_lists (refolosit intre apeluri)
+    :return: o lista noua
+    """
+    if predecessors is None:
+        # un PrecedenceIndex are deja listele (reduse) de predecesori
+        predecessors = getattr(precedence_constraints, "predecessors", None)
+    if predecessors is None:
+        predecessors = predecessor_lists(permutation, precedence_constraints)
+    placed = set()
+    order = []
+
+    for node in permutation:
+        if node in placed:
+            continue
+        placed.add(node)
+        stack = [(node, iter(predecessors[node]))]
+        while stack:
+            current, pending = stack[-1]
+            for predecessor in pending:
+                if predecessor not in placed:
+                    placed.add(predecessor)
+                    stack.append((predecessor, iter(predecessors[predecessor])))
+                    break
+            else:
+                stack.pop()
+                order.append(current)
+
+    return order
+
+
+def _topological_order(nodes, successors, indegree, matrix=None, greedy=0.0):
+    indegree = dict(indegree)
+    available = [node for node in nodes if indegree[node] == 0]
+    order = []
+
+    while available:
+        if matrix is not None and order and greedy > 0 and random.random() < greedy:
+            row = matrix[order[-1]]
+            pick = min(range(len(available)), key=lambda k: row[available[k]])
+        else:
+            pick = random.randrange(len(available))
+        available[pick], available[-1] = available[-1], available[pick]
+        node = available.pop()
+        order.append(node)
+
+        for successor in successors[node]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                available.append(successor)
+
+    if len(order) != len(nodes):
+        raise ValueError("Constrangerile de precedenta contin un ciclu")
+    return order
+
+
+def random_topological_order(nodes, precedence_constraints, matrix=None, greedy=0.0):
+    """
+    Construieste direct o permutare valida in O(n + m) (Kahn cu alegere aleatoare intre nodurile disponibile).
+    :param matrix: optional, matricea de cost folosita pentru alegerea greedy
+    :param greedy: probabilitatea ca urmatorul nod sa fie cel mai apropiat vecin disponibil
+    """
+    successors, indegree = _precedence_graph(nodes, precedence_constraints)
+    return _topological_order(nodes, successors, indegree, matrix, greedy)
+
+
+def random_topological_population(nodes, precedence_constraints, size, matrix=None, greedy=0.0):
+    """Ca random_topological_order, pentru o populatie/un roi intreg; graful se construieste o singura data."""
+    successors, indegree = _precedence_graph(nodes, precedence_constraints)
+    return [_topological_order(nodes, successors, indegree, matrix, greedy) for _ in range(size)]
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from feasibility import respects_precedence_batch
+
+# Costurile >= FORBIDDEN_COST marcheaza muchii interzise (ex: 1000000 in fisierele ESC).
+FORBIDDEN_COST = 999999
+
+
+def count(counters, key, amount=1):
+    """Incrementeaza un contor dintr-un dict optional de contoare (evaluari, incercari, ...)."""
+    if counters is not None:
+        counters[key] = counters.get(key, 0) + amount
+
+
+def calculate_fitness_batch(population, matrix, precedence_constraints):
+    """
+    Costul tuturor turelor dintr-o populatie (P x n, noduri 0..n-1) printr-un singur gather pe matrice.
+    Turele care incalca precedenta sau folosesc o muchie interzisa primesc inf.
+    :return: tablou float64 de lungime P
+    """
+    population = np.asarray(population)
+    matrix = np.asarray(matrix)
+
+    edge_costs = matrix[population[:, :-1], population[:, 1:]]
+    fitness = edge_costs.sum(axis=1, dtype=np.int64).astype(np.float64)
+
+    invalid = (edge_costs >= FORBIDDEN_COST).any(axis=1)
+    invalid |= ~respects_precedence_batch(population, precedence_constraints)
+    fitness[invalid] = np.inf
+    return fitness
+
+
+class FitnessCache:
+    """
+    Memo LRU marginit pentru costul permutarilor, ca un individ care reapare
+    intre generatii sa nu mai fie evaluat inca o data.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(individual):
+        return tuple(individual)
+
+    def lookup(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evaluate(self, individual, fitness_function):
+        key = self.key(individual)
+        value = self.lookup(key)
+        if value is None:
+            value = fitness_function(individual)
+            self.store(key, value)
+        return value
+
+    def evaluate_batch(self, population, matrix, precedence_constraints):
+        keys = [self.key(individual) for individual in population]
+        fitness = np.empty(len(keys), dtype=np.float64)
+        missing = []
+        for idx, key in enumerate(keys):
+            value = self.lookup(key)
+            if value is None:
+                missing.append(idx)
+            else:
+                fitness[idx] = value
+        if missing:
+            computed = calculate_fitness_batch([population[idx] for idx in missing], matrix, precedence_constraints)
+            for idx, value in zip(missing, computed.tolist()):
+                fitness[idx] = value
+                self.store(keys[idx], value)
+        return fitness
@@ -1,10 +1,15 @@
 import random
-import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
+
+import crossover
+from feasibility import random_topological_population, respects_precedence
+from fitness import FitnessCache
+from genetic_matrix import tournament_index
+from graph_backend import CompiledGraph, compile_graph
 
 
 def create_graph():
+    import networkx as nx
+
     G = nx.DiGraph() 
 
     
@@ -30,24 +35,15 @@ def create_graph():
     return G, nodes, precedence
 
 
-def respects_precedence(chromosome, precedence_constraints):
-    """
-    Verifica daca un cromozom respecta toate constrangerile de precedenta
-    :param chromosome: o lista de noduri (ex: [1, 2, 3, 4, 5])
-    :param precedence_constraints: lista de tupluri (ex: [(1, 3), (2, 4)])
-    :return: True daca e valid, False daca nu
-    """
-    for before, after in precedence_constraints:
-        if chromosome.index(before) > chromosome.index(after):
-            return False
-    return True
-
 def calculate_fitness(chromosome, graph, precedence_constraints):
     """
     Calculeaza fitness-ul unui cromozom:
     - daca respecta constrangerile -> suma costurilor muchiilor
     - daca nu -> returneaza inf (penalizare)
+    `graph` poate fi si un CompiledGraph (graph_backend), evaluat pe tablouri.
     """
+    if isinstance(graph, CompiledGraph):
+        return graph.fitness(chromosome, precedence_constraints)
     if not respects_precedence(chromosome, precedence_constraints):
         return float('inf')
     
@@ -69,16 +65,9 @@ def generate_initial_population(nodes, population_size, precedence_constraints):
     :param nodes: lista nodurilor (ex: [1, 2, 3, 4, 5])
     :param population_size: cati indivizi sa generam
     :param precedence_constraints: reguli de tipul (i inainte de j)
-    :return: lista cu cromozomi validati
+    :return: lista cu cromozomi construiti direct ca ordini topologice aleatoare
     """
-    population = [] 
-    while len(population) < population_size: 
-        individual = nodes[:] 
-        random.shuffle(individual)
-        if respects_precedence(individual, precedence_constraints):
-            population.append(individual) 
-    return population                     
-   
+    return random_topological_population(nodes, precedence_constraints, population_size)
 
 
 def tournament_selection(population, graph, precedence_constraints, tournament_size=3):
@@ -96,32 +85,12 @@ def tournament_selection(population, graph, precedence_constraints, tournament_s
     return tournament_fitness[0][0]  
 
 
-def order_crossover(parent1, parent2, precedence_constraints):
-    
-    size = len(parent1)
-
-    
-    while True:
-
-       
-        start, end = sorted(random.sample(range(size), 2))
-
-        
-        child = [None] * size
-
-       
-        child[start:end+1] = parent1[start:end+1]
-
-        
-        pointer = 0 
-        for i in range(size): 
-            if child[i] is None: 
-                while parent2[pointer] in child: 
-                    pointer += 1
-                child[i] = parent2[pointer] 
-        
-        if respects_precedence(child, precedence_constraints):
-            return child
+def order_crossover(parent1, parent2, precedence_constraints, max_attempts=20):
+    """
+    Order crossover (OX) cu numar limitat de incercari; daca niciun copil nu respecta
+    precedentele se foloseste incrucisarea PPX, valida prin constructie.
+    """
+    return crossover.order_crossover(parent1, parent2, precedence_constraints, max_attempts=max_attempts)
 
 
 def mutate(individual, precedence_constraints, mutation_rate=0.1):
@@ -139,48 +108,83 @@ def mutate(individual, precedence_constraints, mutation_rate=0.1):
 
 def run_genetic_algorithm(graph, nodes, precedence_constraints,
                           population_size=50, generations=100,
-                          crossover_rate=0.9, mutation_rate=0.1, elitism=True):
-   
+                          crossover_rate=0.9, mutation_rate=0.1, elitism=True,
+                          cache_size=None, verbose=False):
+    """
+    Graful e compilat o singura data (graph_backend.compile_graph: matrice densa sau CSR),
+    iar indivizii neevaluati ai fiecarei generatii sunt evaluati impreuna, vectorizat.
+    Fiecare individ e evaluat o singura data si isi poarta costul cu el (lista `fitness`).
+    Cu `cache_size`, un memo LRU evita reevaluarea copiilor care reapar intre generatii.
+    :param graph: nx.DiGraph sau un CompiledGraph deja construit
+    :param verbose: afiseaza cel mai bun fitness la fiecare generatie
+    """
+    compiled = compile_graph(graph, nodes)
+    precedence = compiled.precedence_indices(precedence_constraints)
+    cache = FitnessCache(cache_size) if cache_size else None
+
+    def evaluate(individuals, fitness):
+        # completeaza pozitiile None din `fitness`
+        missing = [idx for idx, value in enumerate(fitness) if value is None]
+        if cache is not None:
+            keys = {idx: cache.key(individuals[idx]) for idx in missing}
+            for idx in missing:
+                fitness[idx] = cache.lookup(keys[idx])
+            missing = [idx for idx in missing if fitness[idx] is None]
+        if missing:
+            values = compiled.fitness_batch(compiled.to_indices(individuals[idx] for idx in missing), precedence)
+            for idx, value in zip(missing, values.tolist()):
+                fitness[idx] = value
+                if cache is not None:
+                    cache.store(keys[idx], value)
+        return fitness
+
     population = generate_initial_population(nodes, population_size, precedence_constraints)
+    fitness = evaluate(population, [None] * len(population))
     best_fitness_over_time = [] 
 
     for gen in range(generations):
         new_population = []
+        new_fitness = []
 
         
         if elitism:
-            population_fitness = [
-                (ind, calculate_fitness(ind, graph, precedence_constraints)) for ind in population
-            ]
-            population_fitness.sort(key=lambda x: x[1])
-            best_individual = population_fitness[0][0]
-            new_population.append(best_individual)
+            best_index = min(range(len(population)), key=lambda idx: fitness[idx])
+            new_population.append(population[best_index])
+            new_fitness.append(fitness[best_index])
 
         while len(new_population) < population_size:
-            parent1 = tournament_selection(population, graph, precedence_constraints)
-            parent2 = tournament_selection(population, graph, precedence_constraints)
+            index1 = tournament_index(fitness)
+            index2 = tournament_index(fitness)
+            parent1, parent2 = population[index1], population[index2]
 
             
             if random.random() < crossover_rate:
                 child = order_crossover(parent1, parent2, precedence_constraints)
+                child_fitness = None
             else:
                 child = parent1[:]
+                child_fitness = fitness[index1]
 
             
-            child = mutate(child, precedence_constraints, mutation_rate)
+            mutated = mutate(child, precedence_constraints, mutation_rate)
+            if mutated is not child:
+                child_fitness = None
 
-            new_population.append(child)
+            new_population.append(mutated)
+            new_fitness.append(child_fitness)
 
         population = new_population
+        fitness = evaluate(population, new_fitness)
 
         
-        best_fitness = min(calculate_fitness(ind, graph, precedence_constraints) for ind in population)
+        best_fitness = min(fitness)
         best_fitness_over_time.append(best_fitness)
 
-        print(f"Generația {gen + 1}: Best fitness = {best_fitness}")
+        if verbose:
+            print(f"Generația {gen + 1}: Best fitness = {best_fitness}")
 
     
-    best_individual = min(population, key=lambda ind: calculate_fitness(ind, graph, precedence_constraints))
+    best_individual = population[min(range(len(population)), key=lambda idx: fitness[idx])]
     return best_individual, best_fitness_over_time
 
 
@@ -222,7 +226,8 @@ if __name__ == "__main__":
     # Test 6: Algoritmul Principal care repeta toti pasii
     best, history = run_genetic_algorithm(G, nodes, precedence,
                                           population_size=30,
-                                          generations=50)
+                                          generations=50,
+                                          verbose=True)
 
     print("Cel mai bun individ gasit:", best)
     print("Costul lui:", calculate_fitness(best, G, precedence))
@@ -1,10 +1,17 @@
 import random
 
-def respects_precedence(chromosome, precedence_constraints):
-    for before, after in precedence_constraints:
-        if chromosome.index(before) > chromosome.index(after):
-            return False
-    return True
+import numpy as np
+
+from anytime import Budget, Search
+from checkpoint import Checkpoint, load_checkpoint, restore_search
+from crossover import get_crossover, order_crossover
+from diversity import ZobristHash, check_clone_policy, first_occurrences, population_diversity
+from feasibility import random_topological_population, respects_precedence
+from fitness import FORBIDDEN_COST, FitnessCache, calculate_fitness_batch, count
+from instrumentation import RunStats, clock
+from local_search import LocalSearch
+from moves import MoveEvaluator
+from precedence_index import PrecedenceIndex
 
 def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
     if not respects_precedence(chromosome, precedence_constraints):
@@ -20,7 +27,7 @@ def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
             return float('inf')
 
         cost = matrix[u][v]
-        if cost >= 999999:
+        if cost >= FORBIDDEN_COST:
             return float('inf')
 
         total_cost += cost
@@ -29,73 +36,471 @@ def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
 
 
 
-def generate_initial_population_matrix(nodes, population_size, precedence_constraints):
-    population = []
-    while len(population) < population_size:
-        candidate = nodes[:]
-        random.shuffle(candidate)
-        if respects_precedence(candidate, precedence_constraints):
-            population.append(candidate)
-    return population
-
-def tournament_selection_matrix(population, matrix, precedence_constraints, k=3):
-    tournament = random.sample(population, k)
-    tournament.sort(key=lambda ind: calculate_fitness_matrix(ind, matrix, precedence_constraints))
-    return tournament[0]
-
-def order_crossover_matrix(p1, p2, precedence_constraints):
-    size = len(p1)
-    while True:
-        start, end = sorted(random.sample(range(size), 2))
-        child = [None] * size
-        child[start:end+1] = p1[start:end+1]
-        pointer = 0
-        for i in range(size):
-            if child[i] is None:
-                while p2[pointer] in child:
-                    pointer += 1
-                child[i] = p2[pointer]
-        if respects_precedence(child, precedence_constraints):
-            return child
-
-def mutate_matrix(individual, precedence_constraints, mutation_rate=0.1):
+def generate_initial_population_matrix(nodes, population_size, precedence_constraints, matrix=None, greedy=0.0):
+    return random_topological_population(nodes, precedence_constraints, population_size, matrix, greedy)
+
+def tournament_index(fitness, k=3):
+    tournament = random.sample(range(len(fitness)), k)
+    return min(tournament, key=lambda idx: fitness[idx])
+
+def tournament_loser_index(fitness, k=3):
+    tournament = random.sample(range(len(fitness)), k)
+    return max(tournament, key=lambda idx: fitness[idx])
+
+def tournament_selection_matrix(population, fitness, k=3):
+    return population[tournament_index(fitness, k)]
+
+def order_crossover_matrix(p1, p2, precedence_constraints, counters=None, max_attempts=20):
+    return order_crossover(p1, p2, precedence_constraints, counters, max_attempts)
+
+def swap_mutation(individual, precedence_constraints, mutation_rate=0.1, evaluator=None, counters=None):
+    """:return: (individul mutat, (i, j)) sau (individul initial, None) daca nu s-a facut niciun swap"""
     if random.random() < mutation_rate:
         i, j = random.sample(range(len(individual)), 2)
         mutated = individual[:]
         mutated[i], mutated[j] = mutated[j], mutated[i]
-        if respects_precedence(mutated, precedence_constraints):
-            return mutated
-    return individual
+        if evaluator is not None:
+            # verificare locala: conteaza doar precedentele nodurilor dintre pozitiile i si j
+            feasible = evaluator.swap_feasible(individual, i, j)
+        else:
+            feasible = respects_precedence(mutated, precedence_constraints)
+        if feasible:
+            return mutated, (i, j)
+        count(counters, "mutations_rejected")
+    return individual, None
 
-def run_genetic_algorithm_matrix(nodes, matrix, precedence_constraints,
-                                  population_size=50, generations=100,
-                                  crossover_rate=0.9, mutation_rate=0.1, elitism=True):
-    population = generate_initial_population_matrix(nodes, population_size, precedence_constraints)
-    best_fitness_over_time = []
 
-    for gen in range(generations):
+def mutate_matrix(individual, precedence_constraints, mutation_rate=0.1, evaluator=None, counters=None):
+    return swap_mutation(individual, precedence_constraints, mutation_rate, evaluator, counters)[0]
+
+def evaluate_population_matrix(population, fitness, matrix, precedence_constraints, cache=None, counters=None):
+    """
+    Completeaza costurile lipsa (None) din `fitness`; indivizii cu cost cunoscut nu se reevalueaza.
+    :param counters: dict optional; se numara doar evaluarile reale ("evaluations"), iar costurile gasite
+        in memo separat ("cache_hits")
+    """
+    missing = [idx for idx, value in enumerate(fitness) if value is None]
+    if missing:
+        batch = [population[idx] for idx in missing]
+        if cache is not None:
+            hits = cache.hits
+            computed = cache.evaluate_batch(batch, matrix, precedence_constraints)
+            hits = cache.hits - hits
+            count(counters, "evaluations", len(missing) - hits)
+            if hits:
+                count(counters, "cache_hits", hits)
+        else:
+            computed = calculate_fitness_batch(batch, matrix, precedence_constraints)
+            count(counters, "evaluations", len(missing))
+        for idx, value in zip(missing, computed.tolist()):
+            fitness[idx] = value
+    return np.asarray(fitness, dtype=np.float64)
+
+REPLACEMENTS = ("worst", "tournament")
+
+
+class GeneticContext:
+    """
+    Tot ce ramane fix pe durata unei rulari GA: instanta, operatorii si parametrii.
+    O generatie se obtine cu next_generation(population, fitness).
+    Cu steady_state=True populatia e un tablou P x n prealocat: fiecare copil inlocuieste pe loc
+    cel mai slab individ (sau perdantul unui turneu), iar copiii deja prezenti in populatie nu se
+    evalueaza. O "generatie" inseamna atunci population_size copii.
+    """
+
+    def __init__(self, nodes, matrix, precedence_constraints,
+                 population_size=50, crossover_rate=0.9, mutation_rate=0.1, elitism=True,
+                 cache_size=None, init_greedy=0.0, crossover="ox", counters=None,
+                 local_search=None, local_search_moves=None, local_search_time=None, stats=None,
+                 steady_state=False, replacement="worst", clones=None):
+        if replacement not in REPLACEMENTS:
+            raise ValueError(f"Inlocuire necunoscuta: {replacement!r} (disponibile: {REPLACEMENTS})")
+        check_clone_policy(clones)
+        self.nodes = nodes
+        self.matrix = np.asarray(matrix)
+        # indexul de precedenta se construieste o singura data si e folosit de toti operatorii
+        self.index = PrecedenceIndex.from_instance(nodes, precedence_constraints)
+        self.precedence_constraints = self.index
+        self.precedence = self.index.edges
+        self.population_size = population_size
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.elitism = elitism
+        self.init_greedy = init_greedy
+        self.crossover = get_crossover(crossover)
+        self.counters = counters
+        self.local_search = local_search
+        self.local_search_moves = local_search_moves
+        self.local_search_time = local_search_time
+        self.cache = FitnessCache(cache_size) if cache_size else None
+        self.evaluator = MoveEvaluator(self.matrix, self.index)
+        self.improver = LocalSearch(self.matrix, self.index, self.evaluator) if local_search else None
+        # instrumentation.RunStats optional: timpul pe faze (selectie, incrucisare, mutatie, ...)
+        self.stats = stats
+        self.steady_state = steady_state
+        self.replacement = replacement
+        self.clones = clones
+        # hash-urile Zobrist exista doar cand copiile sunt tratate; `hashes` e aliniat cu randurile populatiei
+        # intoarse ultima data (`generation`), ca mutatiile sa le actualizeze incremental
+        self.zobrist = ZobristHash(len(self.matrix)) if clones is not None else None
+        self.generation = None
+        self.hashes = None
+        # steady-state: tabloul populatiei curente (modificat pe loc de la o generatie la alta)
+        self._population = None
+
+    def population_hashes(self, population, hashes=None):
+        """
+        Hash-urile populatiei; cele lipsa (None) din `hashes` se calculeaza (o trecere pentru toate).
+        :return: tablou int64 (None daca nu se folosesc hash-uri)
+        """
+        if self.zobrist is None:
+            return None
+        if hashes is None:
+            # hash-urile retinute sunt valabile doar daca randurile sunt aceleasi obiecte
+            # (migrarea, de exemplu, inlocuieste indivizi direct in lista populatiei)
+            generation = self.generation
+            if generation is not None and len(generation) == len(population) \
+                    and all(row is kept for row, kept in zip(population, generation)):
+                return self.hashes
+            return self.zobrist.hash_batch(population)
+        missing = [idx for idx, value in enumerate(hashes) if value is None]
+        if missing:
+            computed = self.zobrist.hash_batch([population[idx] for idx in missing]).tolist()
+            for idx, value in zip(missing, computed):
+                hashes[idx] = value
+        return np.array(hashes, dtype=np.int64)
+
+    def evaluate(self, population, fitness, hashes=None):
+        """
+        Completeaza costurile lipsa; copiile unui individ din populatie primesc costul lui, fara evaluare
+        (cand copiile sunt tratate, `clones` nu e None).
+        """
+        missing = [idx for idx, value in enumerate(fitness) if value is None]
+        if not missing:
+            return np.asarray(fitness, dtype=np.float64)
+        if self.zobrist is None:
+            return evaluate_population_matrix(population, fitness, self.matrix, self.precedence, self.cache,
+                                              self.counters)
+        first = first_occurrences(self.population_hashes(population, hashes))
+        unique = [idx for idx in missing if first[idx] == idx]
+        if len(unique) < len(missing):
+            count(self.counters, "duplicates_skipped", len(missing) - len(unique))
+        computed = evaluate_population_matrix([population[idx] for idx in unique], [None] * len(unique),
+                                              self.matrix, self.precedence, self.cache, self.counters)
+        for idx, value in zip(unique, computed.tolist()):
+            fitness[idx] = value
+        for idx in missing:
+            fitness[idx] = fitness[first[idx]]
+        return np.asarray(fitness, dtype=np.float64)
+
+    def randomize_clones(self, population, fitness, hashes):
+        """
+        Inlocuieste pe loc copiile (in afara de prima aparitie) cu ordini topologice aleatoare noi.
+        :param hashes: tabloul hash-urilor populatiei, actualizat pe loc
+        """
+        first = first_occurrences(hashes)
+        clones = np.flatnonzero(first != np.arange(len(population))).tolist()
+        if not clones:
+            return
+        fresh = generate_initial_population_matrix(self.nodes, len(clones), self.precedence_constraints)
+        hashes[clones] = self.zobrist.hash_batch(fresh)
+        for idx, individual in zip(clones, fresh):
+            population[idx] = individual
+            fitness[idx] = None
+        count(self.counters, "clones_randomized", len(clones))
+
+    def evaluate_child(self, child, key=None):
+        """
+        Costul unui singur copil (modul steady-state), printr-un gather pe matrice, fara verificarea precedentei:
+        copiii sunt validi prin constructie (incrucisarea, mutatia si cautarea locala pastreaza precedenta).
+        """
+        if self.cache is not None:
+            key = key if key is not None else self.cache.key(child)
+            value = self.cache.lookup(key)
+            if value is not None:
+                count(self.counters, "cache_hits")
+                return value
+        count(self.counters, "evaluations")
+        order = np.asarray(child)
+        costs = self.matrix[order[:-1], order[1:]]
+        value = float('inf') if len(costs) and costs.max() >= FORBIDDEN_COST else float(costs.sum(dtype=np.int64))
+        if self.cache is not None:
+            self.cache.store(key, value)
+        return value
+
+    def initial_population(self):
+        stats = self.stats
+        started = clock() if stats is not None else None
+        population = generate_initial_population_matrix(self.nodes, self.population_size,
+                                                         self.precedence_constraints,
+                                                         self.matrix, self.init_greedy)
+        if stats is not None:
+            started = stats.lap("initialization", started)
+        hashes = None
+        if self.zobrist is not None:
+            hashes = self.zobrist.hash_batch(population)
+            self.generation, self.hashes = list(population), hashes
+        fitness = self.evaluate(population, [None] * len(population), hashes)
+        if stats is not None:
+            stats.lap("evaluation", started)
+        return population, fitness
+
+    def next_generation(self, population, fitness, offer=None):
+        """
+        :param offer: functie (solutie, cost) apelata, in modul steady-state, cu fiecare copil acceptat
+        """
+        if self.steady_state:
+            return self.steady_state_generation(population, fitness, offer)
+        stats = self.stats
+        started = clock() if stats is not None else None
         new_population = []
+        new_fitness = []
+        hashes = self.population_hashes(population)
+        new_hashes = []
 
-        if elitism:
-            best = min(population, key=lambda ind: calculate_fitness_matrix(ind, matrix, precedence_constraints))
-            new_population.append(best)
+        if self.elitism:
+            best_idx = int(np.argmin(fitness))
+            new_population.append(population[best_idx])
+            new_fitness.append(fitness[best_idx])
+            new_hashes.append(hashes[best_idx] if hashes is not None else None)
 
-        while len(new_population) < population_size:
-            p1 = tournament_selection_matrix(population, matrix, precedence_constraints)
-            p2 = tournament_selection_matrix(population, matrix, precedence_constraints)
+        while len(new_population) < self.population_size:
+            i1 = tournament_index(fitness)
+            i2 = tournament_index(fitness)
+            p1, p2 = population[i1], population[i2]
+            if stats is not None:
+                started = stats.lap("selection", started)
 
-            
-            if random.random() < crossover_rate:
-                child = order_crossover_matrix(p1, p2, precedence_constraints)
+            if random.random() < self.crossover_rate:
+                child = self.crossover(p1, p2, self.precedence_constraints, self.counters)
+                child_fitness = None
+                child_hash = None
             else:
                 child = p1[:]
+                child_fitness = fitness[i1]
+                child_hash = hashes[i1] if hashes is not None else None
+            if stats is not None:
+                started = stats.lap("crossover", started)
 
-            child = mutate_matrix(child, precedence_constraints, mutation_rate)
-            new_population.append(child)
+            mutated, swap = swap_mutation(child, self.precedence_constraints, self.mutation_rate, self.evaluator,
+                                          self.counters)
+            if swap is not None:
+                child_fitness = None
+                if child_hash is not None:
+                    child_hash = self.zobrist.swapped(child_hash, child, *swap)
+            if stats is not None:
+                started = stats.lap("mutation", started)
+            if self.improver is not None:
+                mutated, moves = self.improver.improve(mutated, self.local_search,
+                                                       self.local_search_moves, self.local_search_time)
+                if moves:
+                    child_fitness = None
+                    child_hash = None
+                if stats is not None:
+                    started = stats.lap("local_search", started)
+            new_population.append(mutated)
+            new_fitness.append(child_fitness)
+            new_hashes.append(child_hash)
+
+        if self.zobrist is not None:
+            new_hashes = self.population_hashes(new_population, new_hashes)
+            if self.clones == "randomize":
+                self.randomize_clones(new_population, new_fitness, new_hashes)
+            self.generation, self.hashes = list(new_population), new_hashes
+        new_fitness = self.evaluate(new_population, new_fitness, new_hashes if self.zobrist is not None else None)
+        if stats is not None:
+            stats.lap("evaluation", started)
+        return new_population, new_fitness
+
+    def steady_state_generation(self, population, fitness, offer=None):
+        """
+        population_size pasi steady-state, cu inlocuire pe loc in tablourile populatiei.
+        Un copil inlocuieste perdantul doar daca nu e mai slab (cu elitism), deci cel mai bun ramane.
+        Copiii deja prezenti in populatie sunt mereu sariti (indiferent de `clones`).
+        :return: aceleasi tablouri (population P x n, fitness), modificate pe loc
+        """
+        if population is not self._population:
+            # prima generatie, o reluare sau o populatie noua: se copiaza, apoi se modifica pe loc
+            population = np.array(population, dtype=np.int64)
+            fitness = np.array(fitness, dtype=np.float64)
+            self._population = population
+        fitness = np.asarray(fitness, dtype=np.float64)
+        # multiset-ul membrilor se reface la fiecare generatie, pentru ca populatia poate fi modificata pe loc
+        # intre generatii (ex. migrare); O(P * n), sub costul celor population_size copii
+        members = {}
+        for row in population.tolist():
+            key = tuple(row)
+            members[key] = members.get(key, 0) + 1
+        stats = self.stats
+        started = clock() if stats is not None else None
+
+        for _ in range(self.population_size):
+            i1 = tournament_index(fitness)
+            i2 = tournament_index(fitness)
+            if stats is not None:
+                started = stats.lap("selection", started)
+
+            p1 = population[i1].tolist()
+            if random.random() < self.crossover_rate:
+                child = self.crossover(p1, population[i2].tolist(), self.precedence_constraints, self.counters)
+            else:
+                child = p1
+            if stats is not None:
+                started = stats.lap("crossover", started)
+
+            child = mutate_matrix(child, self.precedence_constraints, self.mutation_rate, self.evaluator,
+                                  self.counters)
+            if stats is not None:
+                started = stats.lap("mutation", started)
+            key = tuple(child)
+            if self.improver is not None and key not in members:
+                child, moves = self.improver.improve(child, self.local_search,
+                                                     self.local_search_moves, self.local_search_time)
+                if moves:
+                    key = tuple(child)
+                if stats is not None:
+                    started = stats.lap("local_search", started)
+
+            if key in members:
+                # copia unui membru: nu se evalueaza si nu intra in populatie
+                count(self.counters, "duplicates_skipped")
+                continue
+            child_fitness = self.evaluate_child(child, key)
+            if stats is not None:
+                started = stats.lap("evaluation", started)
+
+            if self.replacement == "worst":
+                loser = int(np.argmax(fitness))
+            else:
+                loser = tournament_loser_index(fitness)
+            if self.elitism and child_fitness > fitness[loser]:
+                if stats is not None:
+                    started = stats.lap("replacement", started)
+                continue
+            old_key = tuple(population[loser].tolist())
+            if members[old_key] == 1:
+                del members[old_key]
+            else:
+                members[old_key] -= 1
+            members[key] = 1
+            population[loser] = child
+            fitness[loser] = child_fitness
+            if stats is not None:
+                started = stats.lap("replacement", started)
+            if offer is not None:
+                offer(child, child_fitness)
+        return population, fitness
+
+def iter_genetic_algorithm_matrix(nodes, matrix, precedence_constraints, search, checkpoint=None, state=None,
+                                   **ga_options):
+    """
+    Generator: ruleaza GA-ul pana la epuizarea bugetului din `search` (anytime.Search) si produce
+    cate un Incumbent la fiecare imbunatatire. Istoricul (costul minim din populatie per generatie)
+    ramane in search.history.
+    :param checkpoint: checkpoint.Checkpoint optional, salvat la sfarsitul generatiilor cerute
+    :param state: (populatie, fitness) de la care se continua (reluare); implicit o populatie initiala noua
+    :param ga_options: parametrii lui GeneticContext (population_size, crossover, local_search, ...)
+    """
+    context = GeneticContext(nodes, matrix, precedence_constraints, counters=search.counters, **ga_options)
+    stats = context.stats
+    if state is None:
+        population, fitness = context.initial_population()
+        if stats is not None:
+            stats.record_diversity(search.generation, *population_diversity(population,
+                                                                            context.population_hashes(population)))
+        best = int(np.argmin(fitness))
+        incumbent = search.offer(population[best], fitness[best])
+        if incumbent is not None:
+            yield incumbent
+    else:
+        population, fitness = state
+
+    # steady-state: fiecare copil acceptat e oferit imediat (incumbentii au evaluarile si timpul exacte)
+    improvements = []
+
+    def offer(solution, value):
+        incumbent = search.offer(solution, value)
+        if incumbent is not None:
+            improvements.append(incumbent)
+
+    while not search.exhausted():
+        search.begin_generation()
+        population, fitness = context.next_generation(population, fitness, offer)
+        if stats is not None:
+            stats.record_diversity(search.generation, *population_diversity(population,
+                                                                            context.population_hashes(population)))
+        best = int(np.argmin(fitness))
+        offer(population[best], fitness[best])
+        search.end_generation(fitness[best])
+        if checkpoint is not None and checkpoint.due(search.generation):
+            checkpoint.save(search, population=np.asarray(population, dtype=np.int64), fitness=fitness)
+        yield from improvements
+        improvements.clear()
+
+
+def run_genetic_algorithm_matrix(nodes, matrix, precedence_constraints,
+                                  population_size=50, generations=100,
+                                  crossover_rate=0.9, mutation_rate=0.1, elitism=True,
+                                  cache_size=None, init_greedy=0.0, crossover="ox", counters=None,
+                                  local_search=None, local_search_moves=None, local_search_time=None,
+                                  time_limit=None, max_evaluations=None, max_stall=None, target_fitness=None,
+                                  callback=None, profile=False, checkpoint=None, checkpoint_interval=10,
+                                  steady_state=False, replacement="worst", clones=None):
+    """
+    :param crossover: "ox" (implicit, OX-ul de dinainte, cu reincercari limitate), "ppx", "one_point"
+        (valizi prin constructie) sau "ox_repair" (un singur OX, copilul invalid e reparat; se numara in counters["repairs"])
+    :param counters: dict optional in care se numara evaluarile (doar cele reale; costurile gasite in memo-ul
+        cache_size intra la "cache_hits"), incercarile si fallback-urile incrucisarii
+    :param local_search: None, "sop3", "oropt" sau "2opt" - etapa memetica aplicata fiecarui copil,
+        cu bugetul local_search_moves (mutari) / local_search_time (secunde) per copil
+    :param generations: numarul maxim de generatii (None = fara limita, daca e dat alt criteriu)
+    :param time_limit, max_evaluations, max_stall, target_fitness: criterii de oprire (anytime.Budget)
+    :param callback: apelat cu fiecare Incumbent nou (cea mai buna solutie de pana acum)
+    :param profile: True (sau un instrumentation.RunStats, ex. cu trace=True) - masoara timpul pe faze
+    :param checkpoint: fisier .npz rescris la fiecare `checkpoint_interval` generatii;
+        rularea se continua cu resume_genetic_algorithm_matrix
+    :param steady_state: inlocuire pe loc, copil cu copil (vezi GeneticContext); replacement = "worst"
+        sau "tournament" alege individul inlocuit, copiile membrilor se numara in counters["duplicates_skipped"]
+    :param clones: None (implicit, fara hash-uri), "skip" (copiile nu se reevalueaza) sau "randomize" (copiile
+        sunt inlocuite cu ordini aleatoare noi); cu profile, RunStats primeste si diversitatea populatiei
+        la fiecare generatie
+    :return: cel mai bun individ gasit si costul minim din populatie la fiecare generatie;
+        cu profile, si RunStats-ul rularii: (best, history, stats)
+    """
+    stats = RunStats(counters) if profile is True else (profile or None)
+    if stats is not None:
+        counters = stats.counters
+    budget = Budget(generations, time_limit, max_evaluations, max_stall, target_fitness)
+    search = Search(budget, counters, callback)
+    ga_options = dict(population_size=population_size, crossover_rate=crossover_rate,
+                      mutation_rate=mutation_rate, elitism=elitism, cache_size=cache_size,
+                      init_greedy=init_greedy, crossover=crossover, local_search=local_search,
+                      local_search_moves=local_search_moves, local_search_time=local_search_time,
+                      steady_state=steady_state, replacement=replacement, clones=clones)
+    saver = Checkpoint(checkpoint, checkpoint_interval, "ga", ga_options, budget) if checkpoint else None
+    for _ in iter_genetic_algorithm_matrix(nodes, matrix, precedence_constraints, search, saver,
+                                           stats=stats, **ga_options):
+        pass
+    if stats is not None:
+        return search.best, search.history, stats.finish()
+    return search.best, search.history
 
-        population = new_population
-        best_fitness = min(calculate_fitness_matrix(ind, matrix, precedence_constraints) for ind in population)
-        best_fitness_over_time.append(best_fitness)
 
-    best_individual = min(population, key=lambda ind: calculate_fitness_matrix(ind, matrix, precedence_constraints))
-    return best_individual, best_fitness_over_time
+def resume_genetic_algorithm_matrix(path, nodes, matrix, precedence_constraints, counters=None, callback=None,
+                                    checkpoint_interval=None):
+    """
+    Continua o rulare din checkpoint-ul `path`, cu aceiasi parametri si acelasi buget, si continua sa
+    scrie checkpoint-uri in acelasi fisier. Rezultatul e identic cu al rularii neintrerupte.
+    :return: (best, history), ca run_genetic_algorithm_matrix
+    """
+    arrays, state = load_checkpoint(path, "ga")
+    if arrays["population"].shape[1] != len(nodes):
+        raise ValueError("Checkpoint-ul nu corespunde instantei (numar diferit de noduri)")
+    search = restore_search(arrays, state, counters, callback)
+    ga_options = state["params"]
+    saver = Checkpoint(path, checkpoint_interval or state["interval"], "ga", ga_options, search.budget)
+    population = arrays["population"].tolist()
+    for _ in iter_genetic_algorithm_matrix(nodes, matrix, precedence_constraints, search, saver,
+                                           (population, arrays["fitness"]), **ga_options):
+        pass
+    return search.best, search.history
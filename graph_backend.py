@@ -0,0 +1,117 @@
+import numpy as np
+
+from feasibility import as_precedence_array, respects_precedence, respects_precedence_batch
+
+# Reprezentare compilata a unui nx.DiGraph pentru solverele pe graf (genetic_algorithm, pso_algorithm):
+# nodurile primesc indici 0..n-1, iar greutatile muchiilor stau intr-un tablou
+# - "dense": matrice n x n float64, cu inf pentru muchiile lipsa (grafuri mici sau dense)
+# - "csr": indptr / indices / data, cu cautare binara in vecinii sortati ai lui u,
+#   indices[indptr[u]:indptr[u + 1]] (grafuri mari si rare)
+# Un tur care foloseste o muchie lipsa are costul inf (inf se propaga prin suma), ca in calculate_fitness.
+
+BACKENDS = ("auto", "dense", "csr")
+DENSE_MAX_NODES = 2048
+
+
+class CompiledGraph:
+
+    def __init__(self, graph, nodes=None, backend="auto", weight="weight"):
+        """
+        :param graph: nx.DiGraph cu greutatile in atributul `weight` (implicit 1 daca lipseste)
+        :param nodes: ordinea nodurilor (implicit graph.nodes)
+        :param backend: "dense", "csr" sau "auto" (dense pana la DENSE_MAX_NODES noduri sau densitate >= 1/4)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend necunoscut: {backend!r} (disponibile: {BACKENDS})")
+        self.nodes = list(graph.nodes if nodes is None else nodes)
+        self.index = {node: idx for idx, node in enumerate(self.nodes)}
+        n = self.n = len(self.nodes)
+
+        edges = [(self.index[u], self.index[v], data.get(weight, 1))
+                 for u, v, data in graph.edges(data=True) if u in self.index and v in self.index]
+        sources = np.fromiter((u for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((v for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+
+        if backend == "auto":
+            backend = "dense" if n <= DENSE_MAX_NODES or len(edges) * 4 >= n * n else "csr"
+        self.backend = backend
+
+        if backend == "dense":
+            self.weights = np.full((n, n), np.inf)
+            self.weights[sources, targets] = weights
+            self._rows = self.weights.tolist()
+        else:
+            # sortare dupa (u, v): vecinii fiecarui rand sunt contigui si crescatori
+            order = np.lexsort((targets, sources))
+            self.indices = targets[order]
+            self.data = weights[order]
+            self.indptr = np.searchsorted(sources[order], np.arange(n + 1))
+            self.max_degree = int(np.diff(self.indptr).max()) if n else 0
+
+    def to_indices(self, population):
+        """Populatie de etichete -> tablou P x n de indici."""
+        index = self.index
+        population = list(population)
+        flat = np.fromiter((index[node] for individual in population for node in individual), dtype=np.int64)
+        return flat.reshape(len(population), -1)
+
+    def precedence_indices(self, precedence_constraints):
+        """Perechile (inainte, dupa) traduse in indici, ca tablou m x 2."""
+        pairs = [(self.index[before], self.index[after]) for before, after in precedence_constraints]
+        return as_precedence_array(pairs)
+
+    def edge_weights(self, sources, targets):
+        """Greutatile muchiilor (tablouri de indici); inf pentru muchiile lipsa."""
+        if self.backend == "dense":
+            return self.weights[sources, targets]
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if len(self.indices) == 0:
+            return np.full(np.broadcast(sources, targets).shape, np.inf)
+        # cautare binara vectorizata, fiecare interogare doar in randul ei (O(log grad) pasi)
+        low, end = self.indptr[sources], self.indptr[sources + 1]
+        high = end.copy()
+        last = len(self.indices) - 1
+        for _ in range(self.max_degree.bit_length()):
+            active = low < high
+            middle = np.minimum((low + high) // 2, last)
+            right = active & (self.indices[middle] < targets)
+            low = np.where(right, middle + 1, low)
+            high = np.where(active & ~right, middle, high)
+        positions = np.minimum(low, last)
+        found = (low < end) & (self.indices[positions] == targets)
+        return np.where(found, self.data[positions], np.inf)
+
+    def tour_cost(self, chromosome):
+        """Costul unui tur dat prin etichete (fara verificarea precedentei)."""
+        index = self.index
+        idx = [index[node] for node in chromosome]
+        if self.backend == "dense":
+            rows = self._rows
+            return sum(rows[u][v] for u, v in zip(idx, idx[1:]))
+        idx = np.asarray(idx, dtype=np.int64)
+        return float(self.edge_weights(idx[:-1], idx[1:]).sum())
+
+    def fitness(self, chromosome, precedence_constraints):
+        if not respects_precedence(chromosome, precedence_constraints):
+            return float('inf')
+        return self.tour_cost(chromosome)
+
+    def fitness_batch(self, population, precedence):
+        """
+        Costul tuturor turelor dintr-o populatie de indici (P x n) intr-o singura trecere vectorizata.
+        :param precedence: tabloul m x 2 din precedence_indices
+        :return: tablou float64, inf pentru ture cu muchii lipsa sau care incalca precedenta
+        """
+        population = np.asarray(population, dtype=np.int64)
+        fitness = self.edge_weights(population[:, :-1], population[:, 1:]).sum(axis=1)
+        fitness[~respects_precedence_batch(population, precedence)] = np.inf
+        return fitness
+
+
+def compile_graph(graph, nodes=None, backend="auto"):
+    """Compileaza un nx.DiGraph (un CompiledGraph existent e refolosit)."""
+    if isinstance(graph, CompiledGraph):
+        return graph
+    return CompiledGraph(graph, nodes, backend)
@@ -0,0 +1,118 @@
+import argparse
+
+import numpy as np
+
+from fitness import FORBIDDEN_COST
+
+# Generator de instante TSPLIB-SOP sintetice, in formatul fisierelor ESC (citibil de parse_sop_file):
+# nodul 0 e startul, nodul n-1 e finalul, iar c[i][j] = -1 inseamna ca j trebuie vizitat inaintea lui i.
+# Nodurile interne primesc un nivel 0..dag_depth-1; o precedenta u -> v poate aparea doar daca
+# nivelul lui u e mai mic decat al lui v, deci graful e mereu aciclic. Drumul care parcurge nodurile
+# pe niveluri nu are muchii interzise, asa ca orice instanta generata are cel putin o solutie valida.
+# Matricea se scrie rand cu rand; in memorie se tin doar O(n) valori (plus un rand).
+
+FORBIDDEN_EDGE = 1000000
+COST_DISTRIBUTIONS = ("uniform", "normal", "euclidean")
+
+
+def _cost_row(rng, i, n, distribution, low, high, points):
+    if distribution == "uniform":
+        return rng.integers(low, high + 1, size=n)
+    if distribution == "normal":
+        row = rng.normal((low + high) / 2, (high - low) / 6, size=n)
+        return np.clip(np.rint(row), low, high).astype(np.int64)
+    if distribution == "euclidean":
+        distance = np.sqrt(((points - points[i]) ** 2).sum(axis=1))
+        return (low + np.rint(distance * (high - low) / np.sqrt(2))).astype(np.int64)
+    raise ValueError(f"Distributie de cost necunoscuta: {distribution!r} (disponibile: {COST_DISTRIBUTIONS})")
+
+
+def generate_sop_instance(path, n, precedence_density=0.01, dag_depth=10, forbidden_fraction=0.0,
+                          cost_distribution="uniform", cost_low=0, cost_high=1000, seed=None, name=None):
+    """
+    Scrie o instanta SOP cu n noduri (inclusiv start si final) in `path`.
+    :param precedence_density: probabilitatea unei precedente directe intre doua noduri de pe niveluri diferite
+    :param dag_depth: numarul de niveluri ale DAG-ului de precedente (adancimea maxima a unui lant)
+    :param forbidden_fraction: fractiunea muchiilor (i, j) marcate interzise (FORBIDDEN_EDGE)
+    :param cost_distribution: "uniform", "normal" sau "euclidean" (puncte aleatoare in patratul unitate)
+    :return: numarul de precedente directe scrise (fara cele implicite fata de start si final)
+    """
+    if n < 3:
+        raise ValueError("Instanta trebuie sa aiba cel putin 3 noduri (start, final si un nod intern)")
+    rng = np.random.default_rng(seed)
+    name = name or f"synthetic{n}.sop"
+
+    level = np.full(n, -1, dtype=np.int64)
+    level[1:n - 1] = rng.integers(0, max(1, dag_depth), size=n - 2)
+    level[n - 1] = max(1, dag_depth)
+    points = rng.random((n, 2)) if cost_distribution == "euclidean" else None
+
+    # drumul garantat: start, nodurile interne in ordinea nivelurilor, final
+    inner = np.arange(1, n - 1)
+    path_order = np.concatenate(([0], inner[np.lexsort((rng.random(n - 2), level[1:n - 1]))], [n - 1]))
+    path_next = np.empty(n, dtype=np.int64)
+    path_next[path_order[:-1]] = path_order[1:]
+    path_next[n - 1] = -1
+
+    internal = np.zeros(n, dtype=bool)
+    internal[1:n - 1] = True
+    precedences = 0
+
+    with open(path, 'w') as f:
+        f.write(f"NAME: {name}\n")
+        f.write("TYPE: SOP\n")
+        f.write(f"COMMENT: synthetic instance (seed={seed}, density={precedence_density}, "
+                f"depth={dag_depth}, forbidden={forbidden_fraction}, costs={cost_distribution})\n")
+        f.write(f"DIMENSION: {n}\n")
+        f.write("EDGE_WEIGHT_TYPE: EXPLICIT\n")
+        f.write("EDGE_WEIGHT_FORMAT: FULL_MATRIX\n")
+        f.write("EDGE_WEIGHT_SECTION\n")
+        f.write(f"{n}\n")
+
+        for i in range(n):
+            row = _cost_row(rng, i, n, cost_distribution, cost_low, cost_high, points)
+
+            if forbidden_fraction > 0:
+                row[rng.random(n) < forbidden_fraction] = FORBIDDEN_EDGE
+            if i == 0:
+                row[n - 1] = FORBIDDEN_EDGE
+            if path_next[i] >= 0:
+                row[path_next[i]] = min(int(row[path_next[i]]), FORBIDDEN_COST - 1)
+
+            if i == n - 1:
+                row[:] = -1
+            elif i > 0:
+                row[0] = -1
+                predecessors = internal & (level < level[i]) & (rng.random(n) < precedence_density)
+                row[predecessors] = -1
+                precedences += int(predecessors.sum())
+            row[i] = 0
+
+            f.write(" ".join(map(str, row.tolist())))
+            f.write("\n")
+
+        f.write("EOF\n")
+
+    return precedences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genereaza o instanta TSPLIB-SOP sintetica")
+    parser.add_argument("output")
+    parser.add_argument("-n", "--nodes", type=int, required=True)
+    parser.add_argument("--density", type=float, default=0.01, help="densitatea precedentelor directe")
+    parser.add_argument("--depth", type=int, default=10, help="numarul de niveluri al DAG-ului")
+    parser.add_argument("--forbidden", type=float, default=0.0, help="fractiunea muchiilor interzise")
+    parser.add_argument("--costs", choices=COST_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--low", type=int, default=0)
+    parser.add_argument("--high", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    precedences = generate_sop_instance(args.output, args.nodes, args.density, args.depth, args.forbidden,
+                                        args.costs, args.low, args.high, args.seed)
+    print(f"{args.output}: {args.nodes} noduri, {precedences} precedente directe")
+
+
+if __name__ == "__main__":
+    main()
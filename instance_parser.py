@@ -1,37 +1,102 @@
-def parse_sop_file(filepath):
+import hashlib
+import os
+
+import numpy as np
+
+
+def _read_dimension(header):
+    for line in header.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "DIMENSION":
+            return int(value.strip())
+    raise ValueError("DIMENSION lipseste din fisierul SOP")
+
+
+def parse_sop_arrays(filepath):
+    """
+    Citeste o instanta TSPLIB-SOP direct in tablouri NumPy.
+    Precedentele vin din intrarile -1 ale matricei (c[i][j] = -1 -> j inaintea lui i)
+    si, daca exista, din PRECEDENCE_SECTION.
+    :return: dimension, matricea de cost (np.int32, n x n), precedentele (np.int32, m x 2) ca (before, after)
+    """
     with open(filepath, 'r') as f:
-        lines = f.readlines()
-
-    dimension = 0
-    matrix = []
-    precedence_constraints = []
-    reading_matrix = False
-    reading_precedence = False
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("DIMENSION"):
-            dimension = int(line.split(":")[1].strip())
-        elif line.startswith("EDGE_WEIGHT_SECTION"):
-            reading_matrix = True
-            continue
-        elif line.startswith("PRECEDENCE_SECTION"):
-            reading_matrix = False
-            reading_precedence = True
-            continue
-        elif line.startswith("EOF"):
-            break
-
-        if reading_matrix:
-            row = list(map(int, line.split()))
-            if row:
-                matrix.append(row)
-
-        elif reading_precedence:
-            parts = line.split()
-            if len(parts) == 2:
-                i, j = map(int, parts)
-                precedence_constraints.append((i - 1, j - 1))  
+        text = f.read()
+
+    header, _, body = text.partition("EDGE_WEIGHT_SECTION")
+    dimension = _read_dimension(header)
+    body = body.split("EOF", 1)[0]
+    weights_text, _, precedence_text = body.partition("PRECEDENCE_SECTION")
 
+    weights = np.fromstring(weights_text, dtype=np.int64, sep=' ')
+    if weights.size == dimension * dimension + 1 and weights[0] == dimension:
+        weights = weights[1:]  # linia cu dimensiunea de la inceputul sectiunii (ESC07/25/78)
+    if weights.size != dimension * dimension:
+        raise ValueError(f"EDGE_WEIGHT_SECTION are {weights.size} valori, asteptate {dimension * dimension}")
+    matrix = weights.astype(np.int32).reshape(dimension, dimension)
+
+    after, before = np.nonzero(matrix == -1)
+    edges = [np.column_stack((before, after))]
+    if precedence_text.strip():
+        pairs = np.fromstring(precedence_text, dtype=np.int64, sep=' ')
+        edges.append(pairs[:pairs.size - pairs.size % 2].reshape(-1, 2) - 1)
+    precedence = np.unique(np.concatenate(edges).astype(np.int32).reshape(-1, 2), axis=0)
+
+    return dimension, matrix, precedence
+
+
+def parse_sop_file(filepath):
+    dimension, matrix, precedence = parse_sop_arrays(filepath)
     nodes = list(range(dimension))
-    return nodes, matrix, precedence_constraints
+    precedence_constraints = [tuple(pair) for pair in precedence.tolist()]
+    return nodes, matrix.tolist(), precedence_constraints
+
+
+# Instanta compilata: matricea int32 si precedentele (m x 2) salvate ca .npy,
+# cu cheie hash-ul fisierului sursa, ca sa poata fi incarcate prin mmap.
+# CACHE_VERSION se incrementeaza cand se schimba interpretarea fisierului.
+CACHE_VERSION = 2
+
+
+def file_hash(filepath):
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_dir(filepath):
+    return os.environ.get("SOP_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(filepath)), ".sop_cache")
+
+
+def compiled_paths(filepath, cache_dir=None):
+    cache_dir = cache_dir or default_cache_dir(filepath)
+    key = f"{file_hash(filepath)}.v{CACHE_VERSION}"
+    return (os.path.join(cache_dir, key + ".matrix.npy"),
+            os.path.join(cache_dir, key + ".precedence.npy"))
+
+
+def _save_atomic(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def load_instance(filepath, cache_dir=None, mmap_mode='r'):
+    """
+    Incarca o instanta din cache-ul compilat (o compileaza la prima rulare).
+    :return: nodes, matricea de cost (np.int32, n x n), precedentele (np.int32, m x 2)
+    """
+    matrix_path, precedence_path = compiled_paths(filepath, cache_dir)
+
+    if not (os.path.exists(matrix_path) and os.path.exists(precedence_path)):
+        _, cost_matrix, precedence = parse_sop_arrays(filepath)
+        os.makedirs(os.path.dirname(matrix_path), exist_ok=True)
+        _save_atomic(precedence_path, precedence)
+        _save_atomic(matrix_path, cost_matrix)
+
+    cost_matrix = np.load(matrix_path, mmap_mode=mmap_mode)
+    precedence = np.load(precedence_path, mmap_mode=mmap_mode)
+    nodes = list(range(cost_matrix.shape[0]))
+    return nodes, cost_matrix, precedence
@@ -0,0 +1,96 @@
+import json
+import time
+
+# Instrumentare optionala pentru GA/PSO (profile=True): timp cumulat pe faze, contoare si evaluari/secunda.
+# Solverele masoara fazele cu `lap` (doar cand au un RunStats), deci fara profile costul e un test `if`.
+# Exportul e JSON (as_dict / to_json) sau trace Chrome/Perfetto (to_trace, cu trace=True).
+# Tot aici se pastreaza diversitatea populatiei per generatie (indivizi distincti, entropie pozitionala).
+
+clock = time.perf_counter
+
+
+class RunStats:
+
+    def __init__(self, counters=None, trace=False):
+        """
+        :param counters: dict-ul de contoare folosit de solver (evaluations, crossover_attempts, repairs, ...)
+        :param trace: pastreaza si fiecare interval masurat, pentru to_trace
+        """
+        self.counters = counters if counters is not None else {}
+        self.phases = {}
+        self.events = [] if trace else None
+        self.diversity = []
+        self.start = clock()
+        self.wall_time = None
+
+    def lap(self, phase, since):
+        """Adauga la `phase` timpul scurs de la `since`; returneaza momentul curent (inceputul fazei urmatoare)."""
+        now = clock()
+        entry = self.phases.get(phase)
+        if entry is None:
+            entry = self.phases[phase] = [0.0, 0]
+        entry[0] += now - since
+        entry[1] += 1
+        if self.events is not None:
+            self.events.append((phase, since, now - since))
+        return now
+
+    def record_diversity(self, generation, distinct, entropy):
+        self.diversity.append((generation, distinct, entropy, clock()))
+
+    def finish(self):
+        self.wall_time = clock() - self.start
+        return self
+
+    @property
+    def elapsed(self):
+        return self.wall_time if self.wall_time is not None else clock() - self.start
+
+    @property
+    def evaluations_per_second(self):
+        elapsed = self.elapsed
+        return self.counters.get("evaluations", 0) / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        result = {
+            "wall_time": self.elapsed,
+            "evaluations_per_second": self.evaluations_per_second,
+            "counters": dict(self.counters),
+            "phases": {phase: {"seconds": seconds, "calls": calls}
+                       for phase, (seconds, calls) in sorted(self.phases.items(), key=lambda item: -item[1][0])},
+        }
+        if self.diversity:
+            result["diversity"] = [{"generation": generation, "distinct": distinct, "entropy": entropy}
+                                   for generation, distinct, entropy, _ in self.diversity]
+        return result
+
+    def summary(self):
+        """Tabel text cu fazele in ordinea timpului consumat."""
+        elapsed = self.elapsed
+        lines = [f"wall time {elapsed:.3f}s, {self.evaluations_per_second:.0f} eval/s"]
+        for phase, info in self.as_dict()["phases"].items():
+            share = info["seconds"] / elapsed * 100 if elapsed > 0 else 0.0
+            lines.append(f"  {phase:<18} {info['seconds']:10.4f}s {share:6.1f}%  ({info['calls']} calls)")
+        for key, value in sorted(self.counters.items()):
+            lines.append(f"  {key:<18} {value}")
+        if self.diversity:
+            generation, distinct, entropy, _ = self.diversity[-1]
+            lines.append(f"  diversity          {distinct} distinct, entropy {entropy:.3f} (generation {generation})")
+        return "\n".join(lines)
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def to_trace(self, path):
+        """Trace Chrome (chrome://tracing, Perfetto): un eveniment "X" pentru fiecare interval masurat."""
+        if self.events is None:
+            raise ValueError("RunStats a fost creat fara trace=True")
+        events = [{"name": phase, "ph": "X", "pid": 0, "tid": 0,
+                   "ts": (start - self.start) * 1e6, "dur": duration * 1e6}
+                  for phase, start, duration in self.events]
+        events += [{"name": "diversity", "ph": "C", "pid": 0, "ts": (moment - self.start) * 1e6,
+                    "args": {"distinct": distinct, "entropy": entropy}}
+                   for _, distinct, entropy, moment in self.diversity]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "otherData": self.as_dict()}, f)
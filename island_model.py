@@ -0,0 +1,138 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from genetic_matrix import GeneticContext
+from shared_instance import SharedInstance
+
+# Model insular pentru GA-ul pe matrice: K subpopulatii evolueaza independent in procese separate,
+# iar la fiecare `migration_interval` generatii cei mai buni `migrants` indivizi ai fiecarei insule
+# ii inlocuiesc pe cei mai slabi din insulele vecine (topologie "ring" sau "full").
+# Cu mai multe procese, instanta ajunge la workeri prin memorie partajata (SharedInstance), fara copii.
+
+TOPOLOGIES = ("ring", "full")
+
+_context = None
+
+
+def _init_worker(nodes, matrix, precedence_constraints, options):
+    # instanta ajunge o singura data in fiecare proces, nu la fiecare task;
+    # in pool `matrix` e un SharedInstance deja atasat (matricea si indexul sunt in memoria partajata)
+    global _context
+    if isinstance(matrix, SharedInstance):
+        matrix, precedence_constraints = matrix.matrix, matrix.index
+    _context = GeneticContext(nodes, matrix, precedence_constraints, **options)
+
+
+def island_seed(seed, island, epoch):
+    return int(np.random.SeedSequence([seed, island, epoch]).generate_state(1)[0])
+
+
+def _evolve_island(island, epoch, seed, population, fitness, generations):
+    random.seed(island_seed(seed, island, epoch))
+    context = _context
+    context.counters = {}
+
+    if population is None:
+        population, fitness = context.initial_population()
+    else:
+        fitness = np.asarray(fitness, dtype=np.float64)
+
+    history = []
+    for _ in range(generations):
+        population, fitness = context.next_generation(population, fitness)
+        history.append(float(fitness.min()))
+
+    return population, fitness.tolist(), history, context.counters
+
+
+def _neighbours(island, islands, topology):
+    if topology == "ring":
+        return [(island - 1) % islands] if islands > 1 else []
+    return [other for other in range(islands) if other != island]
+
+
+def migrate(populations, fitnesses, migrants, topology="ring"):
+    """Cei mai buni `migrants` indivizi ai vecinilor ii inlocuiesc pe cei mai slabi din fiecare insula."""
+    islands = len(populations)
+    emigrants = []
+    for population, fitness in zip(populations, fitnesses):
+        best = sorted(range(len(fitness)), key=lambda idx: fitness[idx])[:migrants]
+        # copie (nu view): in modul steady-state populatia e un tablou NumPy modificat pe loc mai jos
+        emigrants.append([(population[idx].copy(), fitness[idx]) for idx in best])
+
+    for island in range(islands):
+        arrivals = [individual for other in _neighbours(island, islands, topology) for individual in emigrants[other]]
+        population, fitness = populations[island], fitnesses[island]
+        worst = sorted(range(len(fitness)), key=lambda idx: fitness[idx], reverse=True)[:len(arrivals)]
+        for idx, (individual, value) in zip(worst, arrivals):
+            population[idx] = individual
+            fitness[idx] = value
+
+
+def run_island_model(nodes, matrix, precedence_constraints,
+                     islands=4, generations=100, migration_interval=10, migrants=2,
+                     topology="ring", processes=None, seed=None, counters=None, **ga_options):
+    """
+    Ruleaza `islands` GA-uri (GeneticContext) in paralel, cu migrare periodica intre ele.
+    :param processes: numarul de procese (implicit min(islands, nr. de nuclee)); 1 = totul in procesul curent
+    :param seed: seed-ul global; insula k foloseste la epoca e seed-ul derivat island_seed(seed, k, e)
+    :param ga_options: parametrii GA (population_size, crossover, local_search, ...)
+    :return: cel mai bun individ global si istoricul global (minimul peste insule la fiecare generatie)
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topologie necunoscuta: {topology!r} (disponibile: {TOPOLOGIES})")
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    processes = processes or min(islands, os.cpu_count() or 1)
+
+    populations = [None] * islands
+    fitnesses = [None] * islands
+    history = []
+
+    executor = None
+    shared = None
+    if processes > 1:
+        shared = SharedInstance.create(matrix, precedence_constraints)
+        executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                       initargs=(nodes, shared, None, ga_options))
+    else:
+        _init_worker(nodes, matrix, precedence_constraints, ga_options)
+
+    try:
+        done = 0
+        epoch = 0
+        while done < generations:
+            span = min(migration_interval, generations - done)
+            tasks = [(island, epoch, seed, populations[island], fitnesses[island], span) for island in range(islands)]
+            if executor is not None:
+                results = list(executor.map(_evolve_island, *zip(*tasks)))
+            else:
+                results = [_evolve_island(*task) for task in tasks]
+
+            histories = []
+            for island, (population, fitness, island_history, island_counters) in enumerate(results):
+                populations[island], fitnesses[island] = population, fitness
+                histories.append(island_history)
+                if counters is not None:
+                    for key, value in island_counters.items():
+                        counters[key] = counters.get(key, 0) + value
+            history.extend(min(values) for values in zip(*histories))
+
+            done += span
+            epoch += 1
+            if done < generations and islands > 1 and migrants > 0:
+                migrate(populations, fitnesses, migrants, topology)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+
+    best_island = min(range(islands), key=lambda island: min(fitnesses[island]))
+    fitness = fitnesses[best_island]
+    best_individual = populations[best_island][min(range(len(fitness)), key=lambda idx: fitness[idx])]
+    return best_individual, history
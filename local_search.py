@@ -0,0 +1,171 @@
+import time
+
+from fitness import FORBIDDEN_COST
+from moves import MoveEvaluator
+
+# Cautare locala pentru SOP, pornind de la o ordine valida; toate mutarile pastreaza precedentele.
+# - "sop3": SOP-3-exchange lexicografic cu etichetare (Gambardella & Dorigo, 2000). Doua segmente
+#   consecutive left = t[h+1..i] si right = t[i+1..j] isi schimba locul; ordinea din segmente
+#   se pastreaza, deci costul se schimba doar pe 3 muchii. Mutarea e valida daca niciun nod din
+#   left nu trebuie sa preceada un nod din right; etichetarea succesorilor (predecesorilor)
+#   opreste extinderea segmentului imediat ce apare un astfel de nod.
+# - "oropt": acelasi schimb, dar segmentul mutat are cel mult 3 noduri.
+# - "2opt": inversarea unui segment fara constrangeri interne (delta O(1) prin sume prefix).
+
+LOCAL_SEARCH_METHODS = ("sop3", "oropt", "2opt")
+
+
+class LocalSearch:
+    def __init__(self, matrix, precedence_constraints, evaluator=None):
+        self.evaluator = evaluator or MoveEvaluator(matrix, precedence_constraints)
+        base = self.evaluator.matrix
+        n = len(base)
+        inf = float('inf')
+        # nodul fictiv n inchide turul la ambele capete, cu muchii de cost 0
+        cost = [[c if c < FORBIDDEN_COST else inf for c in row] + [0] for row in base]
+        cost.append([0] * (n + 1))
+        self.cost = cost
+        self.n = n
+        self._label = [0] * (n + 1)
+        self._mark = 0
+
+    def improve(self, order, method="sop3", max_moves=None, time_limit=None):
+        """
+        Imbunatateste o ordine valida pana la un optim local sau pana se epuizeaza bugetul.
+        :param max_moves: numarul maxim de mutari aplicate
+        :param time_limit: timp maxim in secunde
+        :return: noua ordine (lista) si numarul de mutari aplicate
+        """
+        if method == "sop3":
+            return self.sop_3_exchange(order, max_moves, time_limit)
+        if method == "oropt":
+            return self.sop_3_exchange(order, max_moves, time_limit, max_segment=3)
+        if method == "2opt":
+            return self.two_opt(order, max_moves, time_limit)
+        raise ValueError(f"Cautare locala necunoscuta: {method!r} (disponibile: {LOCAL_SEARCH_METHODS})")
+
+    # --- SOP-3-exchange ----------------------------------------------------------------------
+
+    def _forward(self, tour, h, max_segment):
+        cost, successors, label = self.cost, self.evaluator.successors, self._label
+        self._mark += 1
+        mark = self._mark
+        last = len(tour) - 2
+        a, a1 = tour[h], tour[h + 1]
+        cost_a = cost[a][a1]
+
+        for i in range(h + 1, last):
+            if max_segment and i - h > max_segment:
+                break
+            b, b1 = tour[i], tour[i + 1]
+            for s in successors[b]:
+                label[s] = mark
+            cost_ab = cost_a + cost[b][b1]
+            cost_a_b1 = cost[a][b1]
+            for j in range(i + 1, last + 1):
+                d = tour[j]
+                if label[d] == mark:
+                    break
+                d1 = tour[j + 1]
+                gain = cost_ab + cost[d][d1] - cost_a_b1 - cost[d][a1] - cost[b][d1]
+                if gain > 0:
+                    return h, i, j
+        return None
+
+    def _backward(self, tour, j, max_segment):
+        cost, predecessors, label = self.cost, self.evaluator.predecessors, self._label
+        self._mark += 1
+        mark = self._mark
+        d, d1 = tour[j], tour[j + 1]
+        cost_d = cost[d][d1]
+
+        for i in range(j - 1, 0, -1):
+            if max_segment and j - i > max_segment:
+                break
+            b, b1 = tour[i], tour[i + 1]
+            for p in predecessors[b1]:
+                label[p] = mark
+            cost_bd = cost_d + cost[b][b1]
+            cost_b_d1 = cost[b][d1]
+            for h in range(i - 1, -1, -1):
+                a1 = tour[h + 1]
+                if label[a1] == mark:
+                    break
+                a = tour[h]
+                gain = cost_bd + cost[a][a1] - cost[a][b1] - cost[d][a1] - cost_b_d1
+                if gain > 0:
+                    return h, i, j
+        return None
+
+    def sop_3_exchange(self, order, max_moves=None, time_limit=None, max_segment=None):
+        pad = self.n
+        tour = [pad] + list(order) + [pad]
+        # pozitia fiecarui nod in tur (ca in moves.Tour), actualizata doar pe segmentul mutat
+        position = [0] * (pad + 1)
+        for idx, v in enumerate(tour[:-1]):
+            position[v] = idx
+        deadline = time.perf_counter() + time_limit if time_limit else None
+
+        # "don't push stack": se reexamineaza doar nodurile atinse de o mutare reusita
+        stack = list(reversed(order))
+        in_stack = [True] * (pad + 1)
+        in_stack[pad] = False
+        moves = 0
+
+        while stack:
+            if max_moves is not None and moves >= max_moves:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            node = stack.pop()
+            in_stack[node] = False
+            p = position[node]
+
+            move = self._forward(tour, p, max_segment) or self._backward(tour, p, max_segment)
+            if move is None:
+                continue
+
+            h, i, j = move
+            touched = (tour[h], tour[h + 1], tour[i], tour[i + 1], tour[j], tour[j + 1])
+            tour[h + 1:j + 1] = tour[i + 1:j + 1] + tour[h + 1:i + 1]
+            for k in range(h + 1, j + 1):
+                position[tour[k]] = k
+            moves += 1
+            for v in touched:
+                if not in_stack[v] and v != pad:
+                    in_stack[v] = True
+                    stack.append(v)
+            if not in_stack[node]:
+                in_stack[node] = True
+                stack.append(node)
+
+        return tour[1:-1], moves
+
+    # --- 2-opt (inversare de segment) --------------------------------------------------------
+
+    def two_opt(self, order, max_moves=None, time_limit=None):
+        tour = self.evaluator.tour(order)
+        predecessors = self.evaluator.predecessors
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        n = len(tour.order)
+        moves = 0
+        improved = True
+
+        while improved:
+            improved = False
+            for i in range(n - 1):
+                if max_moves is not None and moves >= max_moves:
+                    return tour.order, moves
+                if deadline is not None and time.perf_counter() > deadline:
+                    return tour.order, moves
+                for j in range(i + 1, n):
+                    # un predecesor al lui order[j] in segment face inversarea (si orice extindere) invalida
+                    if any(tour.position[q] >= i for q in predecessors[tour.order[j]]):
+                        break
+                    if tour.reversal_delta(i, j) < 0:
+                        tour.reverse(i, j)
+                        moves += 1
+                        improved = True
+                        break
+
+        return tour.order, moves
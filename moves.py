@@ -0,0 +1,318 @@
+import numpy as np
+
+from fitness import FORBIDDEN_COST
+from precedence_index import PrecedenceIndex
+
+# Evaluare incrementala a mutarilor pe o permutare (noduri 0..n-1):
+# - swap(i, j): schimba nodurile de pe pozitiile i si j
+# - insert(i, j): muta nodul de pe pozitia i pe pozitia j
+# - reverse(i, j): inverseaza segmentul i..j
+# Costul se schimba doar pe cele <= 4 muchii de la capete (O(1)), iar la reverse si pe muchiile
+# interne, acoperite de sume prefix. Precedenta se verifica local: doar constrangerile nodurilor
+# mutate (sau din segment) care cad in intervalul i..j isi pot schimba starea.
+
+
+def positions_of(order):
+    position = [0] * len(order)
+    for idx, node in enumerate(order):
+        position[node] = idx
+    return position
+
+
+class MoveEvaluator:
+    """
+    Datele instantei (matrice, indexul de precedenta) partajate de toate turele evaluate.
+    Succesorii/predecesorii sunt cei din reducerea tranzitiva: aceleasi ordini valide, liste mai scurte.
+    """
+
+    def __init__(self, matrix, precedence_constraints):
+        self._costs = matrix
+        self._matrix = None if isinstance(matrix, np.ndarray) else matrix
+        self.index = PrecedenceIndex.from_instance(matrix, precedence_constraints)
+        self.successors = self.index.successors
+        self.predecessors = self.index.predecessors
+
+    @property
+    def matrix(self):
+        # lista de liste (indexare scalara rapida), construita abia cand sunt necesare costurile;
+        # verificarile de precedenta (ex. mutatia GA) nu copiaza matricea
+        if self._matrix is None:
+            self._matrix = self._costs.tolist()
+        return self._matrix
+
+    def tour(self, order, fitness=None):
+        return Tour(self, order, fitness)
+
+    # --- muchii afectate de fiecare mutare -------------------------------------------------
+
+    @staticmethod
+    def swap_edges(order, i, j):
+        if i > j:
+            i, j = j, i
+        n = len(order)
+        a, b = order[i], order[j]
+        removed, added = [], []
+        if i > 0:
+            removed.append((order[i - 1], a))
+            added.append((order[i - 1], b))
+        if j < n - 1:
+            removed.append((b, order[j + 1]))
+            added.append((a, order[j + 1]))
+        if j == i + 1:
+            removed.append((a, b))
+            added.append((b, a))
+        else:
+            removed.extend(((a, order[i + 1]), (order[j - 1], b)))
+            added.extend(((b, order[i + 1]), (order[j - 1], a)))
+        return removed, added
+
+    @staticmethod
+    def insertion_edges(order, i, j):
+        n = len(order)
+        a = order[i]
+        removed, added = [], []
+        if i > 0:
+            removed.append((order[i - 1], a))
+        if i < n - 1:
+            removed.append((a, order[i + 1]))
+        if 0 < i < n - 1:
+            added.append((order[i - 1], order[i + 1]))
+        if i < j:
+            added.append((order[j], a))
+            if j < n - 1:
+                removed.append((order[j], order[j + 1]))
+                added.append((a, order[j + 1]))
+        else:
+            added.append((a, order[j]))
+            if j > 0:
+                removed.append((order[j - 1], order[j]))
+                added.append((order[j - 1], a))
+        return removed, added
+
+    @staticmethod
+    def reversal_boundary_edges(order, i, j):
+        n = len(order)
+        removed, added = [], []
+        if i > 0:
+            removed.append((order[i - 1], order[i]))
+            added.append((order[i - 1], order[j]))
+        if j < n - 1:
+            removed.append((order[j], order[j + 1]))
+            added.append((order[i], order[j + 1]))
+        return removed, added
+
+    def edges_delta(self, removed, added):
+        """:return: (diferenta de cost, diferenta in numarul de muchii interzise)"""
+        matrix = self.matrix
+        cost = 0
+        forbidden = 0
+        for u, v in added:
+            c = matrix[u][v]
+            cost += c
+            forbidden += c >= FORBIDDEN_COST
+        for u, v in removed:
+            c = matrix[u][v]
+            cost -= c
+            forbidden -= c >= FORBIDDEN_COST
+        return cost, forbidden
+
+    # --- schimbarea numarului de constrangeri incalcate -------------------------------------
+
+    def swap_violations(self, position, i, j, a, b):
+        if i > j:
+            i, j, a, b = j, i, b, a
+        delta = 0
+        for s in self.successors[a]:
+            if i < position[s] <= j:
+                delta += 1
+        for p in self.predecessors[a]:
+            if i < position[p] <= j:
+                delta -= 1
+        for p in self.predecessors[b]:
+            if i < position[p] < j:
+                delta += 1
+        for s in self.successors[b]:
+            if i < position[s] < j:
+                delta -= 1
+        return delta
+
+    def insertion_violations(self, position, i, j, a):
+        delta = 0
+        if i < j:
+            for s in self.successors[a]:
+                if i < position[s] <= j:
+                    delta += 1
+            for p in self.predecessors[a]:
+                if i < position[p] <= j:
+                    delta -= 1
+        else:
+            for p in self.predecessors[a]:
+                if j <= position[p] < i:
+                    delta += 1
+            for s in self.successors[a]:
+                if j <= position[s] < i:
+                    delta -= 1
+        return delta
+
+    def reversal_violations(self, order, position, i, j):
+        delta = 0
+        for k in range(i, j + 1):
+            for s in self.successors[order[k]]:
+                q = position[s]
+                if i <= q <= j:
+                    delta += 1 if q > k else -1
+        return delta
+
+    def swap_feasible(self, order, i, j, position=None):
+        """True daca swap-ul nu introduce nicio incalcare noua (pentru o ordine valida: ramane valida)."""
+        if position is None:
+            position = positions_of(order)
+        if i > j:
+            i, j = j, i
+        a, b = order[i], order[j]
+        index = self.index
+        if j > index.latest[a] or i < index.earliest[b] or index.must_precede(a, b):
+            return False
+        for s in self.successors[a]:
+            if i < position[s] <= j:
+                return False
+        for p in self.predecessors[b]:
+            if i < position[p] < j:
+                return False
+        return True
+
+
+class Tour:
+    """
+    O permutare cu indexul pozitiilor, costul brut, numarul de muchii interzise si numarul de
+    constrangeri incalcate, toate actualizate incremental la fiecare mutare.
+    """
+
+    def __init__(self, evaluator, order, fitness=None):
+        self.evaluator = evaluator
+        self.order = list(order)
+        self.position = positions_of(self.order)
+        self._prefix = None
+
+        if fitness is not None and fitness != float('inf'):
+            # ordine deja evaluata si valida: nu mai refacem calculul complet
+            self.cost = fitness
+            self.forbidden = 0
+            self.violations = 0
+            return
+
+        matrix = evaluator.matrix
+        edge_costs = [matrix[u][v] for u, v in zip(self.order, self.order[1:])]
+        self.cost = sum(edge_costs)
+        self.forbidden = sum(c >= FORBIDDEN_COST for c in edge_costs)
+        position = self.position
+        self.violations = sum(position[s] < position[node]
+                              for node, successors in enumerate(evaluator.successors)
+                              for s in successors)
+
+    @property
+    def feasible(self):
+        return self.violations == 0
+
+    @property
+    def fitness(self):
+        if self.violations or self.forbidden:
+            return float('inf')
+        return self.cost
+
+    def _delta(self, removed, added):
+        cost, forbidden = self.evaluator.edges_delta(removed, added)
+        if self.forbidden + forbidden > 0:
+            return float('inf')
+        return cost
+
+    # --- swap ---------------------------------------------------------------------------------
+
+    def swap_delta(self, i, j):
+        return self._delta(*self.evaluator.swap_edges(self.order, i, j))
+
+    def swap_feasible(self, i, j):
+        order = self.order
+        return self.violations + self.evaluator.swap_violations(self.position, i, j, order[i], order[j]) == 0
+
+    def swap(self, i, j):
+        order, position, evaluator = self.order, self.position, self.evaluator
+        a, b = order[i], order[j]
+        cost, forbidden = evaluator.edges_delta(*evaluator.swap_edges(order, i, j))
+        self.violations += evaluator.swap_violations(position, i, j, a, b)
+        self.cost += cost
+        self.forbidden += forbidden
+        order[i], order[j] = b, a
+        position[a], position[b] = j, i
+        self._prefix = None
+
+    # --- insertion ----------------------------------------------------------------------------
+
+    def insertion_delta(self, i, j):
+        return self._delta(*self.evaluator.insertion_edges(self.order, i, j))
+
+    def insertion_feasible(self, i, j):
+        delta = self.evaluator.insertion_violations(self.position, i, j, self.order[i])
+        return self.violations + delta == 0
+
+    def insert(self, i, j):
+        if i == j:
+            return
+        order, position, evaluator = self.order, self.position, self.evaluator
+        a = order[i]
+        cost, forbidden = evaluator.edges_delta(*evaluator.insertion_edges(order, i, j))
+        self.violations += evaluator.insertion_violations(position, i, j, a)
+        self.cost += cost
+        self.forbidden += forbidden
+        order.insert(j, order.pop(i))
+        for k in range(min(i, j), max(i, j) + 1):
+            position[order[k]] = k
+        self._prefix = None
+
+    # --- segment reversal ---------------------------------------------------------------------
+
+    def _prefix_sums(self):
+        if self._prefix is None:
+            matrix, order = self.evaluator.matrix, self.order
+            forward, backward, forward_bad, backward_bad = [0], [0], [0], [0]
+            for u, v in zip(order, order[1:]):
+                f, b = matrix[u][v], matrix[v][u]
+                forward.append(forward[-1] + f)
+                backward.append(backward[-1] + b)
+                forward_bad.append(forward_bad[-1] + (f >= FORBIDDEN_COST))
+                backward_bad.append(backward_bad[-1] + (b >= FORBIDDEN_COST))
+            self._prefix = forward, backward, forward_bad, backward_bad
+        return self._prefix
+
+    def _reversal_change(self, i, j):
+        if i > j:
+            i, j = j, i
+        forward, backward, forward_bad, backward_bad = self._prefix_sums()
+        cost, forbidden = self.evaluator.edges_delta(*self.evaluator.reversal_boundary_edges(self.order, i, j))
+        cost += (backward[j] - backward[i]) - (forward[j] - forward[i])
+        forbidden += (backward_bad[j] - backward_bad[i]) - (forward_bad[j] - forward_bad[i])
+        return cost, forbidden
+
+    def reversal_delta(self, i, j):
+        cost, forbidden = self._reversal_change(i, j)
+        if self.forbidden + forbidden > 0:
+            return float('inf')
+        return cost
+
+    def reversal_feasible(self, i, j):
+        if i > j:
+            i, j = j, i
+        return self.violations + self.evaluator.reversal_violations(self.order, self.position, i, j) == 0
+
+    def reverse(self, i, j):
+        if i > j:
+            i, j = j, i
+        cost, forbidden = self._reversal_change(i, j)
+        self.violations += self.evaluator.reversal_violations(self.order, self.position, i, j)
+        self.cost += cost
+        self.forbidden += forbidden
+        order, position = self.order, self.position
+        order[i:j + 1] = order[i:j + 1][::-1]
+        for k in range(i, j + 1):
+            position[order[k]] = k
+        self._prefix = None
@@ -0,0 +1,136 @@
+import numpy as np
+
+from feasibility import as_precedence_array
+
+# Index de precedenta construit o singura data per instanta (noduri 0..n-1):
+# - inchiderea tranzitiva ca bitset-uri impachetate (uint64): ancestors[v] / descendants[v]
+# - reducerea tranzitiva (doar precedentele directe neredundante), ca liste de predecesori/succesori
+# - numarul de predecesori/succesori tranzitivi si pozitiile cea mai devreme / cea mai tarzie ale fiecarui nod
+# Iterat, indexul produce muchiile reduse, deci poate inlocui lista de constrangeri in orice functie
+# care primeste `precedence_constraints` (o permutare respecta reducerea daca si numai daca respecta tot).
+
+
+def _popcount(bitsets, chunk=1024):
+    counts = np.empty(len(bitsets), dtype=np.int64)
+    for start in range(0, len(bitsets), chunk):
+        block = bitsets[start:start + chunk].view(np.uint8)
+        counts[start:start + chunk] = np.unpackbits(block, axis=1).sum(axis=1)
+    return counts
+
+
+class PrecedenceIndex:
+
+    def __init__(self, n, precedence_constraints):
+        """
+        :param n: numarul de noduri (dimensiunea matricei)
+        :param precedence_constraints: perechi (inainte, dupa), ca lista sau tablou m x 2
+        """
+        pairs = np.unique(as_precedence_array(precedence_constraints), axis=0)
+        self.n = n
+        self.words = (n + 63) // 64
+
+        direct_predecessors = [[] for _ in range(n)]
+        direct_successors = [[] for _ in range(n)]
+        for before, after in pairs.tolist():
+            direct_predecessors[after].append(before)
+            direct_successors[before].append(after)
+
+        self.topological_order = self._topological_order(direct_predecessors, direct_successors)
+        self._word = np.arange(n) >> 6
+        self._bit = np.left_shift(np.uint64(1), (np.arange(n) & 63).astype(np.uint64))
+
+        self.ancestors, self.predecessors = self._closure(self.topological_order, direct_predecessors)
+        self.descendants, self.successors = self._closure(self.topological_order[::-1], direct_successors)
+
+        self.predecessor_count = _popcount(self.ancestors)
+        self.successor_count = _popcount(self.descendants)
+        self.earliest = self.predecessor_count
+        self.latest = n - 1 - self.successor_count
+        self.edges = np.array([(before, after) for after in range(n) for before in self.predecessors[after]],
+                              dtype=np.int64).reshape(-1, 2)
+        self._pairs = list(map(tuple, self.edges.tolist()))
+
+    ARRAYS = ("edges", "ancestors", "descendants", "predecessor_count", "successor_count")
+
+    def arrays(self):
+        """Tablourile indexului (ex. pentru memorie partajata); from_arrays il reface fara recalcul."""
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        arrays["topological_order"] = np.asarray(self.topological_order, dtype=np.int64)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        index = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(index, name, arrays[name])
+        index.n = len(index.ancestors)
+        index.words = index.ancestors.shape[1]
+        index.topological_order = arrays["topological_order"].tolist()
+        index._word = np.arange(index.n) >> 6
+        index._bit = np.left_shift(np.uint64(1), (np.arange(index.n) & 63).astype(np.uint64))
+        index.earliest = index.predecessor_count
+        index.latest = index.n - 1 - index.successor_count
+        index.predecessors = [[] for _ in range(index.n)]
+        index.successors = [[] for _ in range(index.n)]
+        index._pairs = list(map(tuple, index.edges.tolist()))
+        for before, after in index._pairs:
+            index.predecessors[after].append(before)
+            index.successors[before].append(after)
+        return index
+
+    @classmethod
+    def from_instance(cls, nodes, precedence_constraints):
+        """Din rezultatul lui parse_sop_file / load_instance; un index existent e refolosit."""
+        if isinstance(precedence_constraints, cls):
+            return precedence_constraints
+        return cls(len(nodes), precedence_constraints)
+
+    @staticmethod
+    def _topological_order(predecessors, successors):
+        indegree = [len(p) for p in predecessors]
+        order = [node for node, degree in enumerate(indegree) if degree == 0]
+        for node in order:
+            for successor in successors[node]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    order.append(successor)
+        if len(order) != len(predecessors):
+            raise ValueError("Constrangerile de precedenta contin un ciclu")
+        return order
+
+    def _closure(self, order, direct):
+        """Bitset-urile tranzitive si listele reduse, parcurgand nodurile in ordinea data (topologica)."""
+        closure = np.zeros((self.n, self.words), dtype=np.uint64)
+        reduced = [[] for _ in range(self.n)]
+        for node in order:
+            neighbours = direct[node]
+            if not neighbours:
+                continue
+            neighbours = np.asarray(neighbours)
+            inherited = np.bitwise_or.reduce(closure[neighbours], axis=0)
+            # vecinul direct e redundant daca e deja atins prin alt vecin
+            redundant = (inherited[self._word[neighbours]] & self._bit[neighbours]) != 0
+            reduced[node] = neighbours[~redundant].tolist()
+            np.bitwise_or.at(inherited, self._word[neighbours], self._bit[neighbours])
+            closure[node] = inherited
+        return closure, reduced
+
+    # --- muchiile reduse, ca inlocuitor pentru lista de constrangeri ------------------------
+
+    def __iter__(self):
+        return iter(self._pairs)
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.edges if dtype is None else self.edges.astype(dtype)
+
+    # --- interogari O(1) pe perechi -------------------------------------------------------
+
+    def _has(self, bitsets, row, node):
+        return (int(bitsets[row, node >> 6]) >> (node & 63)) & 1 == 1
+
+    def must_precede(self, u, v):
+        """True daca u trebuie vizitat inaintea lui v (direct sau tranzitiv)."""
+        return self._has(self.ancestors, v, u)
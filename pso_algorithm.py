@@ -1,19 +1,16 @@
 import random
-import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
 
-# FUNCTII DE EVALUARE:
+from feasibility import random_topological_population, repair_precedence, respects_precedence
+from fitness import count
+from graph_backend import CompiledGraph, compile_graph
 
-# Functia de verificare a constrangerilor o refolosim
-def respects_precedence(chromosome, precedence_constraints):
-    for before, after in precedence_constraints:
-        if chromosome.index(before) > chromosome.index(after):
-            return False
-    return True
+# FUNCTII DE EVALUARE:
 
 # Functia de fitness (cost total)
+# (`graph` poate fi si un CompiledGraph din graph_backend)
 def calculate_fitness(chromosome, graph, precedence_constraints):
+    if isinstance(graph, CompiledGraph):
+        return graph.fitness(chromosome, precedence_constraints)
     if not respects_precedence(chromosome, precedence_constraints):
         return float('inf')
 
@@ -29,6 +26,8 @@ def calculate_fitness(chromosome, graph, precedence_constraints):
 
 
 def create_graph():
+    import networkx as nx
+
     G = nx.DiGraph() 
 
     nodes = list(range(1, 6))
@@ -72,13 +71,14 @@ class Particle:
 
 
     
-    def apply_velocity(self):
+    def apply_velocity(self, counters=None):
         for i, j in self.velocity:
             self.position[i], self.position[j] = self.position[j], self.position[i]
 
-        
+        # pozitia invalida se repara (cea mai apropiata ordine valida), nu se arunca
         if not respects_precedence(self.position, self.precedence_constraints):
-            self.position = self.pbest[:]
+            self.position = repair_precedence(self.position, self.precedence_constraints)
+            count(counters, "repairs")
 
         self.fitness = calculate_fitness(self.position, self.graph, self.precedence_constraints)
 
@@ -106,13 +106,13 @@ def update_velocity(particle, gbest, w=0.5, c1=1, c2=2):
    
     velocity = []
 
-    inertia_component = random.sample(particle.velocity, int(w * len(particle.velocity))) if particle.velocity else []
+    inertia_component = random.sample(particle.velocity, min(len(particle.velocity), int(w * len(particle.velocity)))) if particle.velocity else []
   
     pbest_component = generate_swap_sequence(particle.position, particle.pbest)
-    pbest_component = random.sample(pbest_component, int(c1 * random.random() * len(pbest_component))) if pbest_component else []
+    pbest_component = random.sample(pbest_component, min(len(pbest_component), int(c1 * random.random() * len(pbest_component)))) if pbest_component else []
 
     gbest_component = generate_swap_sequence(particle.position, gbest)
-    gbest_component = random.sample(gbest_component, int(c2 * random.random() * len(gbest_component))) if gbest_component else []
+    gbest_component = random.sample(gbest_component, min(len(gbest_component), int(c2 * random.random() * len(gbest_component)))) if gbest_component else []
 
     velocity.extend(inertia_component)
     velocity.extend(pbest_component)
@@ -123,9 +123,14 @@ def update_velocity(particle, gbest, w=0.5, c1=1, c2=2):
 
 def run_pso(graph, nodes, precedence_constraints,
             num_particles=30, generations=100,
-            w=0.5, c1=1.5, c2=1.5):
-   
-    swarm = [Particle(nodes, graph, precedence_constraints) for _ in range(num_particles)]
+            w=0.5, c1=1.5, c2=1.5, counters=None, verbose=False):
+    """
+    Graful (nx.DiGraph sau CompiledGraph) e compilat o singura data (graph_backend), iar fiecare
+    particula isi evalueaza pozitia pe tablouri, o data per miscare (particle.fitness).
+    """
+    graph = compile_graph(graph, nodes)
+    positions = random_topological_population(nodes, precedence_constraints, num_particles)
+    swarm = [Particle(position, graph, precedence_constraints) for position in positions]
 
     global_best = min(swarm, key=lambda p: p.pbest_fitness)
     global_best_position = global_best.pbest[:]
@@ -136,7 +141,7 @@ def run_pso(graph, nodes, precedence_constraints,
     for gen in range(generations):
         for particle in swarm:
             
-            fitness = calculate_fitness(particle.position, graph, precedence_constraints)
+            fitness = particle.fitness
             particle.update_personal_best(fitness)
 
             
@@ -147,21 +152,22 @@ def run_pso(graph, nodes, precedence_constraints,
         
         for particle in swarm:
             
-            inertia_component = random.sample(particle.velocity, int(w * len(particle.velocity))) if particle.velocity else []
+            inertia_component = random.sample(particle.velocity, min(len(particle.velocity), int(w * len(particle.velocity)))) if particle.velocity else []
 
             cognitive = generate_swap_sequence(particle.position, particle.pbest)
-            cognitive_component = random.sample(cognitive, int(c1 * random.random() * len(cognitive))) if cognitive else []
+            cognitive_component = random.sample(cognitive, min(len(cognitive), int(c1 * random.random() * len(cognitive)))) if cognitive else []
 
             social = generate_swap_sequence(particle.position, global_best_position)
-            social_component = random.sample(social, int(c2 * random.random() * len(social))) if social else []
+            social_component = random.sample(social, min(len(social), int(c2 * random.random() * len(social)))) if social else []
 
             new_velocity = inertia_component + cognitive_component + social_component
             particle.velocity = new_velocity
 
-            particle.apply_velocity()
+            particle.apply_velocity(counters)
 
         history.append(global_best_fitness)
-        print(f"Generația {gen + 1}: Best fitness = {global_best_fitness}")
+        if verbose:
+            print(f"Generația {gen + 1}: Best fitness = {global_best_fitness}")
 
     return global_best_position, history
 
@@ -179,7 +185,7 @@ if __name__ == "__main__":
     print("Swap-uri necesare:", swaps)
 
     # Test PSO complet
-    best_solution, fitness_evolution = run_pso(G, nodes, precedence)
+    best_solution, fitness_evolution = run_pso(G, nodes, precedence, verbose=True)
 
     print("Cea mai buna solutie gasita:", best_solution)
     print("Costul ei:", calculate_fitness(best_solution, G, precedence))
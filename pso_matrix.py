@@ -1,10 +1,14 @@
-import random
+import numpy as np
 
-def respects_precedence(chromosome, precedence_constraints):
-    for before, after in precedence_constraints:
-        if chromosome.index(before) > chromosome.index(after):
-            return False
-    return True
+from anytime import Budget, Search
+from checkpoint import Checkpoint, load_checkpoint, restore_search
+from diversity import ZobristHash, check_clone_policy, first_occurrences, population_diversity
+from feasibility import (inverse_positions, random_topological_population, repair_precedence, respects_precedence,
+                         respects_precedence_batch)
+from fitness import FORBIDDEN_COST, calculate_fitness_batch, count
+from instrumentation import RunStats, clock
+from local_search import LocalSearch
+from precedence_index import PrecedenceIndex
 
 def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
     if not respects_precedence(chromosome, precedence_constraints):
@@ -19,7 +23,7 @@ def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
             return float('inf')
 
         cost = matrix[u][v]
-        if cost >= 999999:
+        if cost >= FORBIDDEN_COST:
             return float('inf')
 
         total_cost += cost
@@ -29,76 +33,361 @@ def calculate_fitness_matrix(chromosome, matrix, precedence_constraints):
 
 
 def generate_swap_sequence(a, b):
-    a = a[:]
+    """Swap-urile (i, j) care transforma permutarea a in b, in O(n) cu pozitiile inverse ale lui a."""
+    a = list(a)
+    position = {node: idx for idx, node in enumerate(a)}
     swaps = []
     for i in range(len(a)):
         if a[i] != b[i]:
-            j = a.index(b[i])
+            j = position[b[i]]
+            position[a[i]], position[b[i]] = j, i
             a[i], a[j] = a[j], a[i]
             swaps.append((i, j))
     return swaps
 
-class Particle:
-    def __init__(self, nodes, matrix, precedence_constraints):
-        while True:
-            random.shuffle(nodes)
-            if respects_precedence(nodes, precedence_constraints):
-                break
-        self.position = nodes[:] 
-        self.velocity = [] 
-        self.best_position = self.position[:] 
-        self.matrix = matrix
-        self.precedence_constraints = precedence_constraints
-        self.pbest_fitness = calculate_fitness_matrix(self.position, matrix, precedence_constraints)
-        
-
-    def update_personal_best(self):
-        current_fitness = calculate_fitness_matrix(self.position, self.matrix, self.precedence_constraints)
-        if current_fitness < self.pbest_fitness:
-            self.best_position = self.position[:]
-            self.pbest_fitness = current_fitness
 
-def run_pso_matrix(nodes, matrix, precedence_constraints,
-                   num_particles=50, generations=100, w=0.4, c1=1.5, c2=1.5):
+def swap_sequences(positions, targets):
+    """
+    Varianta pe tot roiul a lui generate_swap_sequence: O(n) pasi, fiecare vectorizat peste particule.
+    :param positions: tablou S x n (noduri 0..n-1)
+    :param targets: tablou S x n cu permutarile tinta
+    :return: (swaps, lengths) - swaps e S x n x 2 completat cu zerouri, lengths[s] = nr. de swap-uri valide
+    """
+    current = np.array(positions, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    size, n = current.shape
+    inverse = inverse_positions(current)
+    swaps = np.zeros((size, n, 2), dtype=np.int64)
+    lengths = np.zeros(size, dtype=np.int64)
+
+    for i in range(n):
+        rows = np.flatnonzero(current[:, i] != targets[:, i])
+        if rows.size == 0:
+            continue
+        wanted = targets[rows, i]
+        displaced = current[rows, i]
+        j = inverse[rows, wanted]
+        current[rows, i] = wanted
+        current[rows, j] = displaced
+        inverse[rows, wanted] = i
+        inverse[rows, displaced] = j
+        swaps[rows, lengths[rows], 0] = i
+        swaps[rows, lengths[rows], 1] = j
+        lengths[rows] += 1
+
+    return swaps, lengths
+
+
+def sample_swaps(swaps, lengths, sizes):
+    """
+    Cate un esantion aleator (fara repetitie, in ordine aleatoare) de sizes[s] swap-uri din fiecare rand.
+    :return: (swaps, lengths) in acelasi format completat
+    """
+    size, width = swaps.shape[:2]
+    sizes = np.minimum(sizes, lengths)
+    keys = np.random.random((size, width))
+    keys[np.arange(width)[None, :] >= lengths[:, None]] = np.inf
+    width = int(sizes.max()) if size else 0
+    picked = np.argsort(keys, axis=1)[:, :width]
+    return np.take_along_axis(swaps, picked[:, :, None], axis=1), sizes
+
+
+def concat_swaps(*parts):
+    """Concateneaza pe fiecare rand secventele (swaps, lengths) date, pastrand ordinea lor."""
+    swaps = np.concatenate([part[0] for part in parts], axis=1)
+    valid = np.concatenate([np.arange(part[0].shape[1])[None, :] < part[1][:, None] for part in parts], axis=1)
+    lengths = valid.sum(axis=1)
+    order = np.argsort(~valid, axis=1, kind='stable')[:, :int(lengths.max()) if len(lengths) else 0]
+    return np.take_along_axis(swaps, order[:, :, None], axis=1), lengths
+
+
+def apply_swaps(positions, swaps, lengths, hashes=None, zobrist=None):
+    """
+    Aplica in loc, pe fiecare rand, primele lengths[s] swap-uri (vectorizat peste particule).
+    :param hashes, zobrist: optional, hash-urile Zobrist ale randurilor, actualizate incremental la fiecare swap
+    """
+    for k in range(swaps.shape[1]):
+        rows = np.flatnonzero(lengths > k)
+        if rows.size == 0:
+            break
+        i, j = swaps[rows, k, 0], swaps[rows, k, 1]
+        a, b = positions[rows, i], positions[rows, j]
+        if hashes is not None:
+            hashes[rows] ^= zobrist.swap_delta(i, a, j, b)
+        positions[rows, i], positions[rows, j] = b, a
+
+
+class Swarm:
+    """
+    Roiul ca structura de tablouri: pozitiile, cele mai bune pozitii personale si fitness-ul tuturor
+    particulelor stau in tablouri NumPy (S x n si S), iar vitezele in S x L x 2 plus lungimile lor.
+    Vitezele se construiesc, se aplica si se evalueaza pe tot roiul deodata.
+    Cu repair=True pozitiile care incalca precedenta sunt reparate (repair_precedence) in loc sa fie
+    aruncate; reparatiile se numara in counters["repairs"].
+    Cu `clones` dat, fiecare pozitie are un hash Zobrist (actualizat incremental la fiecare swap):
+    particulele care nu s-au miscat sau au ajuns pe aceeasi pozitie ca alta nu se reevalueaza;
+    cu clones="randomize" copiile sunt mutate pe ordini aleatoare noi.
+    """
+
+    def __init__(self, positions, matrix, precedence_constraints, repair=True, counters=None, stats=None,
+                 clones=None):
+        check_clone_policy(clones)
+        self.matrix = np.asarray(matrix)
+        self.index = PrecedenceIndex.from_instance(self.matrix, precedence_constraints)
+        self.precedence = self.index.edges
+        self.repair = repair
+        self.counters = counters
+        self.stats = stats
+        self.clones = clones
+        self.zobrist = ZobristHash(len(self.matrix)) if clones is not None else None
+        self.positions = np.array(positions, dtype=np.int64)
+        self.hashes = self.zobrist.hash_batch(self.positions) if self.zobrist is not None else None
+        self.fitness = calculate_fitness_batch(self.positions, self.matrix, self.precedence)
+        self.velocity = np.zeros((len(self.positions), 0, 2), dtype=np.int64)
+        self.velocity_lengths = np.zeros(len(self.positions), dtype=np.int64)
+        self.pbest = self.positions.copy()
+        self.pbest_fitness = self.fitness.copy()
+        best = int(np.argmin(self.fitness))
+        self.gbest = self.positions[best].copy()
+        self.gbest_fitness = float(self.fitness[best])
+
+    def __len__(self):
+        return len(self.positions)
+
+    STATE_ARRAYS = ("positions", "fitness", "velocity", "velocity_lengths", "pbest", "pbest_fitness", "gbest")
 
-    swarm = [Particle(nodes[:], matrix, precedence_constraints) for _ in range(num_particles)]
-    global_best = min(swarm, key=lambda p: p.pbest_fitness)
-    global_best_position = global_best.best_position[:]
-    global_best_fitness = global_best.pbest_fitness
-    history = [global_best_fitness]
+    def state(self):
+        """Tablourile roiului (pentru checkpoint)."""
+        arrays = {name: getattr(self, name) for name in self.STATE_ARRAYS}
+        arrays["gbest_fitness"] = np.float64(self.gbest_fitness)
+        return arrays
 
-    for _ in range(generations):
-        for p in swarm:
-            p.update_personal_best()
-            fitness = calculate_fitness_matrix(p.position, matrix, precedence_constraints)
-            if fitness < global_best_fitness:
-                global_best_position = p.position[:]
-                global_best_fitness = fitness
-                
+    def restore(self, arrays):
+        for name in self.STATE_ARRAYS:
+            setattr(self, name, np.array(arrays[name]))
+        self.gbest_fitness = float(arrays["gbest_fitness"])
+        if self.zobrist is not None:
+            self.hashes = self.zobrist.hash_batch(self.positions)
 
-        for p in swarm:
-            
-            inertia_sample_size = min(len(p.velocity), int(w * len(p.velocity))) if p.velocity else 0
-            inertia = random.sample(p.velocity, inertia_sample_size) if inertia_sample_size > 0 else []
+    def step(self, w, c1, c2):
+        """
+        O iteratie PSO: viteza = esantion din viteza veche (w) + spre pbest (c1 * r) + spre gbest (c2 * r).
+        Pozitiile invalide se repara (daca repair=True); particulele care raman totusi invalide
+        (precedenta sau muchii interzise) stau pe loc si isi pastreaza viteza veche.
+        """
+        stats = self.stats
+        started = clock() if stats is not None else None
+        size = len(self)
+        inertia = sample_swaps(self.velocity, self.velocity_lengths,
+                               (w * self.velocity_lengths).astype(np.int64))
 
-            cognitive = generate_swap_sequence(p.position, p.best_position)
-            cognitive_sample_size = min(len(cognitive), int(c1 * random.random() * len(cognitive))) if cognitive else 0
-            cognitive = random.sample(cognitive, cognitive_sample_size) if cognitive_sample_size > 0 else []
+        cognitive, lengths = swap_sequences(self.positions, self.pbest)
+        cognitive = sample_swaps(cognitive, lengths, (c1 * np.random.random(size) * lengths).astype(np.int64))
 
-            social = generate_swap_sequence(p.position, global_best_position)
-            social_sample_size = min(len(social), int(c2 * random.random() * len(social))) if social else 0
-            social = random.sample(social, social_sample_size) if social_sample_size > 0 else []
+        social, lengths = swap_sequences(self.positions, np.broadcast_to(self.gbest, self.positions.shape))
+        social = sample_swaps(social, lengths, (c2 * np.random.random(size) * lengths).astype(np.int64))
 
-            new_velocity = inertia + cognitive + social
-            pos = p.position[:]
-            for i, j in new_velocity:
-                pos[i], pos[j] = pos[j], pos[i]
+        velocity, velocity_lengths = concat_swaps(inertia, cognitive, social)
+        if stats is not None:
+            started = stats.lap("velocity_update", started)
+        candidates = self.positions.copy()
+        hashes = self.hashes.copy() if self.zobrist is not None else None
+        apply_swaps(candidates, velocity, velocity_lengths, hashes, self.zobrist)
+        if self.repair:
+            broken = np.flatnonzero(~respects_precedence_batch(candidates, self.precedence))
+            for index in broken:
+                candidates[index] = repair_precedence(candidates[index].tolist(), predecessors=self.index.predecessors)
+            if hashes is not None and len(broken):
+                hashes[broken] = self.zobrist.hash_batch(candidates[broken])
+            count(self.counters, "repairs", len(broken))
+        if stats is not None:
+            started = stats.lap("move_application", started)
+        if hashes is None:
+            fitness = calculate_fitness_batch(candidates, self.matrix, self.precedence)
+            count(self.counters, "evaluations", size)
+        else:
+            # se evalueaza doar pozitiile noi si distincte; restul primesc costul cunoscut
+            first = first_occurrences(hashes)
+            unique = first == np.arange(size)
+            evaluate = unique & (hashes != self.hashes)
+            fitness = self.fitness.copy()
+            fitness[evaluate] = calculate_fitness_batch(candidates[evaluate], self.matrix, self.precedence)
+            fitness[~unique] = fitness[first[~unique]]
+            evaluated = int(evaluate.sum())
+            count(self.counters, "evaluations", evaluated)
+            if evaluated < size:
+                count(self.counters, "duplicates_skipped", size - evaluated)
+        if stats is not None:
+            started = stats.lap("evaluation", started)
 
-            if respects_precedence(pos, precedence_constraints):
-                p.position = pos
-                p.velocity = new_velocity
+        moved = np.isfinite(fitness)
+        count(self.counters, "moves_reverted", size - int(moved.sum()))
+        self.positions[moved] = candidates[moved]
+        if hashes is not None:
+            self.hashes[moved] = hashes[moved]
+        self.fitness[moved] = fitness[moved]
+        if moved.any():
+            width = max(self.velocity.shape[1], velocity.shape[1])
+            self.velocity = _pad(self.velocity, width)
+            self.velocity[moved] = _pad(velocity, width)[moved]
+            self.velocity_lengths[moved] = velocity_lengths[moved]
+        if self.clones == "randomize":
+            self.randomize_clones()
+        if stats is not None:
+            stats.lap("move_application", started)
 
-        history.append(global_best_fitness)
+    def randomize_clones(self):
+        """Particulele aflate pe aceeasi pozitie ca una anterioara primesc o ordine aleatoare noua si viteza vida."""
+        clones = np.flatnonzero(first_occurrences(self.hashes) != np.arange(len(self)))
+        if len(clones) == 0:
+            return
+        fresh = random_topological_population(list(range(len(self.matrix))), self.index, len(clones))
+        self.positions[clones] = fresh
+        self.hashes[clones] = self.zobrist.hash_batch(self.positions[clones])
+        self.fitness[clones] = calculate_fitness_batch(self.positions[clones], self.matrix, self.precedence)
+        self.velocity_lengths[clones] = 0
+        count(self.counters, "evaluations", len(clones))
+        count(self.counters, "clones_randomized", len(clones))
+
+    def move(self, index, order):
+        self.positions[index] = order
+        if self.zobrist is not None:
+            self.hashes[index] = self.zobrist.hash(self.positions[index])
+        self.fitness[index] = calculate_fitness_batch(self.positions[index:index + 1], self.matrix, self.precedence)[0]
+        count(self.counters, "evaluations")
+
+    def update_bests(self):
+        better = self.fitness < self.pbest_fitness
+        self.pbest[better] = self.positions[better]
+        self.pbest_fitness[better] = self.fitness[better]
+        best = int(np.argmin(self.pbest_fitness))
+        if self.pbest_fitness[best] < self.gbest_fitness:
+            self.gbest = self.pbest[best].copy()
+            self.gbest_fitness = float(self.pbest_fitness[best])
+
+
+def _pad(swaps, width):
+    if swaps.shape[1] >= width:
+        return swaps
+    padding = np.zeros((swaps.shape[0], width - swaps.shape[1], 2), dtype=swaps.dtype)
+    return np.concatenate([swaps, padding], axis=1)
+
+
+def iter_pso_matrix(nodes, matrix, precedence_constraints, search,
+                    num_particles=50, w=0.4, c1=1.5, c2=1.5, init_greedy=0.0,
+                    local_search=None, local_search_moves=None, local_search_time=None, repair=True, stats=None,
+                    checkpoint=None, state=None, clones=None):
+    """
+    Generator: ruleaza PSO pana la epuizarea bugetului din `search` (anytime.Search) si produce cate
+    un Incumbent la fiecare imbunatatire a gbest. Istoricul gbest ramane in search.history.
+    :param stats: instrumentation.RunStats optional (timpul pe faze si diversitatea roiului per generatie)
+    :param checkpoint: checkpoint.Checkpoint optional, salvat la sfarsitul generatiilor cerute
+    :param state: tablourile unui roi salvat (Swarm.state) de la care se continua (reluare)
+    """
+    counters = search.counters
+    started = clock() if stats is not None else None
+    index = PrecedenceIndex.from_instance(nodes, precedence_constraints)
+    improver = LocalSearch(matrix, index) if local_search else None
+    if state is None:
+        positions = random_topological_population(nodes, index, num_particles, matrix, init_greedy)
+        swarm = Swarm(positions, matrix, index, repair, counters, stats, clones)
+    else:
+        swarm = Swarm(state["positions"], matrix, index, repair, counters, stats, clones)
+        swarm.restore(state)
+    if stats is not None:
+        stats.lap("initialization", started)
+
+    if state is None:
+        count(counters, "evaluations", num_particles)
+        if stats is not None:
+            stats.record_diversity(search.generation, *population_diversity(swarm.positions, swarm.hashes))
+        incumbent = search.offer(swarm.gbest, swarm.gbest_fitness)
+        search.history.append(swarm.gbest_fitness)
+        if incumbent is not None:
+            yield incumbent
+
+    while not search.exhausted():
+        search.begin_generation()
+        swarm.step(w, c1, c2)
+
+        if improver is not None:
+            started = clock() if stats is not None else None
+            for particle in range(len(swarm)):
+                improved, moves = improver.improve(swarm.positions[particle].tolist(), local_search,
+                                                   local_search_moves, local_search_time)
+                if moves:
+                    swarm.move(particle, improved)
+            if stats is not None:
+                stats.lap("local_search", started)
+
+        started = clock() if stats is not None else None
+        swarm.update_bests()
+        if stats is not None:
+            stats.lap("best_update", started)
+        if stats is not None:
+            stats.record_diversity(search.generation, *population_diversity(swarm.positions, swarm.hashes))
+        incumbent = search.offer(swarm.gbest, swarm.gbest_fitness)
+        search.end_generation()
+        if checkpoint is not None and checkpoint.due(search.generation):
+            checkpoint.save(search, **swarm.state())
+        if incumbent is not None:
+            yield incumbent
+
+
+def run_pso_matrix(nodes, matrix, precedence_constraints,
+                   num_particles=50, generations=100, w=0.4, c1=1.5, c2=1.5, init_greedy=0.0,
+                   local_search=None, local_search_moves=None, local_search_time=None, counters=None, repair=True,
+                   time_limit=None, max_evaluations=None, max_stall=None, target_fitness=None, callback=None,
+                   profile=False, checkpoint=None, checkpoint_interval=10, clones=None):
+    """
+    :param counters: dict optional in care se numara evaluarile, reparatiile de precedenta ("repairs") si,
+        cu `clones`, pozitiile nereevaluate ("duplicates_skipped": particule nemiscate sau suprapuse)
+    :param repair: repara pozitiile invalide; cu False particulele invalide raman pe loc
+    :param local_search: None, "sop3", "oropt" sau "2opt" - dupa fiecare mutare particula e
+        imbunatatita local, cu bugetul local_search_moves (mutari) / local_search_time (secunde)
+    :param generations: numarul maxim de generatii (None = fara limita, daca e dat alt criteriu)
+    :param time_limit, max_evaluations, max_stall, target_fitness: criterii de oprire (anytime.Budget)
+    :param callback: apelat cu fiecare Incumbent nou (cea mai buna solutie de pana acum)
+    :param profile: True (sau un instrumentation.RunStats, ex. cu trace=True) - masoara timpul pe faze
+    :param checkpoint: fisier .npz rescris la fiecare `checkpoint_interval` generatii;
+        rularea se continua cu resume_pso_matrix
+    :param clones: None (implicit, fara hash-uri), "skip" (copiile nu se reevalueaza) sau "randomize"
+        (particulele suprapuse primesc ordini aleatoare noi); cu profile, RunStats primeste si diversitatea
+        roiului la fiecare generatie
+    :return: gbest si istoricul lui (costul initial + cate o valoare per generatie);
+        cu profile, si RunStats-ul rularii: (best, history, stats)
+    """
+    stats = RunStats(counters) if profile is True else (profile or None)
+    if stats is not None:
+        counters = stats.counters
+    budget = Budget(generations, time_limit, max_evaluations, max_stall, target_fitness)
+    search = Search(budget, counters, callback)
+    pso_options = dict(num_particles=num_particles, w=w, c1=c1, c2=c2, init_greedy=init_greedy,
+                       local_search=local_search, local_search_moves=local_search_moves,
+                       local_search_time=local_search_time, repair=repair, clones=clones)
+    saver = Checkpoint(checkpoint, checkpoint_interval, "pso", pso_options, budget) if checkpoint else None
+    for _ in iter_pso_matrix(nodes, matrix, precedence_constraints, search, stats=stats, checkpoint=saver,
+                             **pso_options):
+        pass
+    if stats is not None:
+        return search.best, search.history, stats.finish()
+    return search.best, search.history
 
-    return global_best_position, history
 
+def resume_pso_matrix(path, nodes, matrix, precedence_constraints, counters=None, callback=None,
+                      checkpoint_interval=None):
+    """
+    Continua o rulare PSO din checkpoint-ul `path` (acelasi roi, aceiasi parametri, acelasi buget)
+    si continua sa scrie checkpoint-uri in acelasi fisier. Rezultatul e identic cu al rularii neintrerupte.
+    :return: (gbest, history), ca run_pso_matrix
+    """
+    arrays, state = load_checkpoint(path, "pso")
+    if arrays["positions"].shape[1] != len(nodes):
+        raise ValueError("Checkpoint-ul nu corespunde instantei (numar diferit de noduri)")
+    search = restore_search(arrays, state, counters, callback)
+    pso_options = state["params"]
+    saver = Checkpoint(path, checkpoint_interval or state["interval"], "pso", pso_options, search.budget)
+    for _ in iter_pso_matrix(nodes, matrix, precedence_constraints, search, checkpoint=saver, state=arrays,
+                             **pso_options):
+        pass
+    return search.best, search.history
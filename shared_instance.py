@@ -0,0 +1,130 @@
+import inspect
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from instance_parser import load_instance
+from precedence_index import PrecedenceIndex
+
+# Instanta (matricea de cost + tablourile indexului de precedenta) pusa o singura data in
+# multiprocessing.shared_memory. Un SharedInstance se transmite workerilor ca un handle mic
+# (numele blocurilor, forme, tipuri): la despachetare procesul se ataseaza la aceleasi pagini,
+# fara copiere, si o singura data per proces. Tablourile atasate sunt read-only.
+# Procesul care a creat instanta raspunde de close() + unlink() (sau `with SharedInstance.create(...)`).
+
+# de la Python 3.13 atasarea nu mai trebuie inregistrata la resource_tracker (care ar sterge blocul)
+_ATTACH_OPTIONS = {"track": False} if "track" in inspect.signature(shared_memory.SharedMemory).parameters else {}
+
+_attached = {}
+
+
+class SharedInstance:
+
+    def __init__(self, blocks, handle, owner):
+        self._blocks = blocks
+        self.handle = handle
+        self.owner = owner
+        self._arrays = {}
+        for name, (block_name, shape, dtype) in handle.items():
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf)
+            array.flags.writeable = False
+            self._arrays[name] = array
+        self._index = None
+
+    @classmethod
+    def create(cls, matrix, precedence_constraints):
+        """Copiaza matricea si indexul de precedenta (construit aici daca nu e dat) in memorie partajata."""
+        matrix = np.ascontiguousarray(matrix)
+        index = PrecedenceIndex.from_instance(matrix, precedence_constraints)
+        arrays = dict(index.arrays(), matrix=matrix)
+
+        blocks, handle = {}, {}
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                blocks[name] = block
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                handle[name] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        instance = cls(blocks, handle, owner=True)
+        instance._index = index
+        return instance
+
+    @classmethod
+    def from_file(cls, filepath, cache_dir=None):
+        nodes, matrix, precedence = load_instance(filepath, cache_dir)
+        return cls.create(matrix, precedence)
+
+    @classmethod
+    def attach(cls, handle):
+        """Ataseaza procesul curent la blocurile descrise de `handle` (o singura data per proces)."""
+        key = tuple(sorted(block_name for block_name, _, _ in handle.values()))
+        instance = _attached.get(key)
+        if instance is None:
+            blocks = {name: shared_memory.SharedMemory(name=block_name, **_ATTACH_OPTIONS)
+                      for name, (block_name, _, _) in handle.items()}
+            instance = _attached[key] = cls(blocks, handle, owner=False)
+        return instance
+
+    def __reduce__(self):
+        # transmis altor procese doar ca handle
+        return SharedInstance.attach, (self.handle,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    # --- datele instantei ----------------------------------------------------------------
+
+    @property
+    def matrix(self):
+        return self._arrays["matrix"]
+
+    @property
+    def nodes(self):
+        return list(range(len(self.matrix)))
+
+    @property
+    def index(self):
+        """PrecedenceIndex peste tablourile partajate (listele reduse se refac local, in O(m))."""
+        if self._index is None:
+            self._index = PrecedenceIndex.from_arrays(self._arrays)
+        return self._index
+
+    @property
+    def precedence(self):
+        return self._arrays["edges"]
+
+    # --- ciclul de viata -----------------------------------------------------------------
+
+    def close(self):
+        """Elibereaza maparea in procesul curent; tablourile obtinute din instanta nu mai trebuie folosite."""
+        self._arrays = {}
+        self._index = None
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # mai exista referinte la tablouri; maparea se elibereaza la iesirea procesului
+                pass
+        _attached.pop(tuple(sorted(block_name for block_name, _, _ in self.handle.values())), None)
+
+    def unlink(self):
+        """Sterge blocurile din sistem (doar procesul care le-a creat)."""
+        if not self.owner:
+            raise ValueError("Doar procesul care a creat instanta o poate sterge (unlink)")
+        for block in self._blocks.values():
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
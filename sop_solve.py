@@ -0,0 +1,190 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from anytime import Budget, Search
+from instance_parser import load_instance
+from instrumentation import RunStats
+
+# Punct de intrare headless pentru rulari scurte, lansate in numar mare de un scheduler:
+#   python sop_solve.py sop_instances/ESC25.sop --algorithm pso --seed 3 --time-limit 5 --param num_particles=80
+# Rezultatul e un singur obiect JSON (stdout sau --output). Se importa doar solverul cerut;
+# matplotlib si networkx nu se incarca deloc (doar solverele pe matrice, fara grafice).
+# --algorithm exact rezolva instanta exact (modulul exact); --target optimal calculeaza intai optimul
+# (in limita --exact-time-limit) si opreste GA/PSO de indata ce il ating.
+
+# algoritm -> (modul, generatorul anytime din modul)
+SOLVERS = {
+    "ga": ("genetic_matrix", "iter_genetic_algorithm_matrix"),
+    "pso": ("pso_matrix", "iter_pso_matrix"),
+}
+
+ALGORITHMS = sorted(SOLVERS) + ["exact"]
+
+DEFAULT_GENERATIONS = 100
+DEFAULT_EXACT_TIME_LIMIT = 60.0
+
+
+def parse_param(text):
+    """KEY=VALUE -> (key, valoare); valoarea e citita ca JSON daca se poate (numere, true/false, null)."""
+    key, separator, value = text.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Parametru invalid: {text!r} (forma ceruta: KEY=VALUE)")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def parse_target(text):
+    """Un cost sau "optimal"."""
+    if text == "optimal":
+        return text
+    try:
+        return float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tinta invalida: {text!r} (un cost sau 'optimal')")
+
+
+def solve(instance, algorithm="ga", params=None, seed=0, generations=None, time_limit=None,
+          max_evaluations=None, max_stall=None, target_fitness=None, history=False, profile=False,
+          exact_time_limit=DEFAULT_EXACT_TIME_LIMIT):
+    """
+    O rulare anytime a unui solver pe matrice.
+    :param generations: implicit DEFAULT_GENERATIONS, daca nu e dat niciun alt criteriu de oprire
+    :param target_fitness: un cost sau "optimal" (optimul demonstrat de solve_exact in `exact_time_limit`
+        secunde; daca nu se demonstreaza in timp, rularea nu are tinta)
+    :return: dict serializabil JSON cu solutia, costul, motivul opririi si contoarele
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritm necunoscut: {algorithm!r} (disponibili: {ALGORITHMS})")
+    if algorithm == "exact":
+        return solve_exact_instance(instance, params, time_limit)
+    if generations is None and time_limit is None and max_evaluations is None and max_stall is None \
+            and target_fitness is None:
+        generations = DEFAULT_GENERATIONS
+    params = dict(params or {})
+    module_name, function_name = SOLVERS[algorithm]
+    iterate = getattr(importlib.import_module(module_name), function_name)
+
+    start = time.perf_counter()
+    nodes, matrix, precedence = load_instance(instance)
+    load_time = time.perf_counter() - start
+
+    optimum = None
+    if target_fitness == "optimal":
+        from exact import solve_exact
+        optimum = solve_exact(nodes, matrix, precedence, time_limit=exact_time_limit)
+        target_fitness = optimum.cost if optimum.optimal else None
+        if target_fitness is None and generations is None and time_limit is None and max_evaluations is None \
+                and max_stall is None:
+            generations = DEFAULT_GENERATIONS
+
+    random.seed(seed)
+    np.random.seed(seed)
+    counters = {}
+    stats = RunStats(counters) if profile else None
+    options = dict(params, stats=stats) if stats is not None else params
+    budget = Budget(generations, time_limit, max_evaluations, max_stall, target_fitness)
+    search = Search(budget, counters)
+    for _ in iterate(nodes, matrix, precedence, search, **options):
+        pass
+
+    record = {
+        "instance": os.path.basename(instance),
+        "algorithm": algorithm,
+        "seed": seed,
+        "params": params,
+        "budget": {"generations": generations, "time_limit": time_limit, "max_evaluations": max_evaluations,
+                   "max_stall": max_stall, "target_fitness": target_fitness},
+        "best_cost": float(search.best_fitness),
+        "best_solution": [int(node) for node in search.best],
+        "stop_reason": search.stop,
+        "generations": search.generation,
+        "evaluations": search.evaluations,
+        "load_time": load_time,
+        "wall_time": search.elapsed,
+        "counters": dict(counters),
+    }
+    if optimum is not None:
+        record["exact"] = {"cost": float(optimum.cost), "optimal": optimum.optimal, "method": optimum.method,
+                           "states": optimum.states, "wall_time": optimum.elapsed}
+    if history:
+        record["history"] = [float(value) for value in search.history]
+    if stats is not None:
+        record["profile"] = stats.finish().as_dict()
+    return record
+
+
+def solve_exact_instance(instance, params=None, time_limit=None):
+    """
+    Rularea "exact": parametrii (--param) merg la solve_exact (method, memory_limit).
+    :return: dict cu aceleasi chei de baza ca solve; "optimal" spune daca costul e demonstrat optim
+    """
+    from exact import solve_exact
+    params = dict(params or {})
+    start = time.perf_counter()
+    nodes, matrix, precedence = load_instance(instance)
+    load_time = time.perf_counter() - start
+    result = solve_exact(nodes, matrix, precedence, time_limit=time_limit, **params)
+    return {
+        "instance": os.path.basename(instance),
+        "algorithm": "exact",
+        "params": params,
+        "budget": {"time_limit": time_limit},
+        "best_cost": float(result.cost),
+        "best_solution": [int(node) for node in result.order] if result.order is not None else None,
+        "optimal": result.optimal,
+        "method": result.method,
+        "states": result.states,
+        "load_time": load_time,
+        "wall_time": result.elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rezolva o instanta TSPLIB-SOP si afiseaza rezultatul ca JSON")
+    parser.add_argument("instance", help="fisier .sop")
+    parser.add_argument("--algorithm", default="ga", choices=ALGORITHMS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--param", dest="params", action="append", type=parse_param, default=[],
+                        metavar="KEY=VALUE", help="parametru al solverului (ex. population_size=80, local_search=sop3)")
+    parser.add_argument("--generations", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None, help="secunde")
+    parser.add_argument("--max-evaluations", type=int, default=None)
+    parser.add_argument("--max-stall", type=int, default=None, help="generatii fara imbunatatire")
+    parser.add_argument("--target", type=parse_target, default=None,
+                        help="oprire la un cost <= TARGET; 'optimal' = optimul calculat de solverul exact")
+    parser.add_argument("--exact-time-limit", type=float, default=DEFAULT_EXACT_TIME_LIMIT,
+                        help="secunde pentru solverul exact cu --target optimal")
+    parser.add_argument("--history", action="store_true", help="include istoricul per generatie")
+    parser.add_argument("--profile", action="store_true", help="include timpul pe faze (instrumentation)")
+    parser.add_argument("--output", default=None, help="fisier JSON (implicit stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        record = solve(args.instance, args.algorithm, dict(args.params), args.seed, args.generations,
+                       args.time_limit, args.max_evaluations, args.max_stall, args.target,
+                       args.history, args.profile, args.exact_time_limit)
+    # RuntimeError acopera exact.ExactLimitExceeded fara a importa modulul exact la fiecare rulare GA/PSO
+    except (OSError, TypeError, ValueError, RuntimeError) as error:
+        print(json.dumps({"instance": args.instance, "algorithm": args.algorithm, "error": str(error)}))
+        return 1
+
+    text = json.dumps(record)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())